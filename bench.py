@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+
+"""Benchmarks for hot paths of pyversion: parsing, comparison, sorting,
+matching and extraction, and time of importing the package.
+
+    python3 bench.py                          # print results
+    python3 bench.py --save baseline.json     # save results as baseline
+    python3 bench.py --compare baseline.json  # fail if slower than baseline by more than threshold
+"""
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from pyversion import version
+from pyversion.version import Version, Comparison, Matcher
+
+
+def corpus(kind, size, seed=0):
+    """Returns list of synthetic version strings of given kind.
+    """
+    rand = random.Random(seed)
+    number = lambda: str(rand.choice([rand.randint(0, 9), rand.randint(0, 99), rand.randint(0, 9999)]))
+    identifier = lambda: rand.choice(['alpha', 'beta', 'rc', 'dev', 'post', number(), number()])
+    strings = []
+    for i in range(size):
+        if kind == 'strict':
+            string = '.'.join([number() for n in range(3)])
+        elif kind == 'permissive':
+            string = '.'.join([number() for n in range(rand.randint(1, 4))])
+        elif kind == 'prerelease':
+            string = '{0}.{1}.{2}-{3}'.format(rand.randint(0, 2), rand.randint(0, 2), rand.randint(0, 2),
+                                              '.'.join([identifier() for n in range(rand.randint(1, 4))]))
+            if rand.random() < 0.3: string += '+build.{0}'.format(number())
+        elif kind == 'long':
+            string = '.'.join(['1', '2', '3', '4'] + [number() for n in range(rand.randint(2, 6))])
+        else:
+            raise ValueError('unknown corpus: {0}'.format(kind))
+        strings.append(string)
+    return strings
+
+
+corpora = {'strict': True, 'permissive': False, 'prerelease': True, 'long': False}
+
+
+def cases(size):
+    """Yields `(name, function, operations)` tuples.
+    Every function performs `operations` operations when called.
+    """
+    for kind, strict in sorted(corpora.items()):
+        strings = corpus(kind, size)
+        versions = [Version._parse(s, strict) for s in strings]
+        pairs = list(zip(versions, versions[1:] + versions[:1]))
+        matcher = Matcher(min=sorted(versions)[size // 4], max=sorted(versions)[size // 4 * 3],
+                          but=versions[:10], strict=strict)
+
+        yield ('{0}/parse'.format(kind), lambda strings=strings, strict=strict:
+               [Version._parse(s, strict) for s in strings], size)
+        yield ('{0}/parse-interned'.format(kind), lambda strings=strings, strict=strict:
+               [Version(s, strict) for s in strings], size)
+        yield ('{0}/valid'.format(kind), lambda strings=strings, strict=strict:
+               [version.valid(s, strict) for s in strings], size)
+        yield ('{0}/extract'.format(kind), lambda strings=strings, strict=strict:
+               [version.extract(s, strict) for s in strings], size)
+        yield ('{0}/comparison'.format(kind), lambda pairs=pairs:
+               [(Comparison(a, b).lt(), Comparison(a, b).gt(), Comparison(a, b).eq()) for a, b in pairs], 3 * size)
+        yield ('{0}/operators'.format(kind), lambda pairs=pairs:
+               [(a < b, a > b, a == b) for a, b in pairs], 3 * size)
+        yield ('{0}/sort'.format(kind), lambda versions=versions: sorted(versions), 1)
+        yield ('{0}/match'.format(kind), lambda versions=versions, matcher=matcher:
+               [matcher.match(v) for v in versions], size)
+
+
+def measure(function, operations, repeat):
+    """Returns `(ops/sec, bytes/op, blocks/op)`.
+    Speed is the best of `repeat` runs; memory is peak traced memory and number of
+    memory blocks still allocated after a separate traced run.
+    """
+    best = None
+    for i in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best: best = elapsed
+        del result
+    tracemalloc.start()
+    blocks = sys.getallocatedblocks()
+    result = function()
+    peak = tracemalloc.get_traced_memory()[1]
+    blocks = sys.getallocatedblocks() - blocks
+    tracemalloc.stop()
+    del result
+    return (operations / best, peak / operations, blocks / operations)
+
+
+def run(size, repeat, only=None):
+    results = {}
+    for name, function, operations in cases(size):
+        if only and not any([name.startswith(prefix) for prefix in only]): continue
+        speed, memory, blocks = measure(function, operations, repeat)
+        results[name] = {'ops': speed, 'bytes': memory, 'blocks': blocks}
+        print('{0:32} {1:>14,.0f} ops/s {2:>10.1f} B/op {3:>8.2f} blocks/op'.format(name, speed, memory, blocks))
+    return results
+
+
+def importtime(module, repeat):
+    """Returns shortest time (in seconds) of importing module in a fresh interpreter.
+    """
+    script = 'import time; start = time.perf_counter(); import {0}; print(time.perf_counter() - start)'.format(module)
+    root = os.path.dirname(os.path.abspath(__file__))
+    return min([float(subprocess.check_output([sys.executable, '-c', script], cwd=root)) for i in range(repeat)])
+
+
+def imports(repeat, budget):
+    """Prints import times and returns True if `import pyversion` fits in budget (milliseconds).
+    """
+    fits = True
+    for module in ('pyversion', 'pyversion.version'):
+        elapsed = importtime(module, repeat) * 1000
+        print('{0:32} {1:>14.2f} ms'.format('import/' + module, elapsed))
+        if module == 'pyversion' and elapsed > budget:
+            print('REGRESSION: import pyversion took {0:.2f} ms (budget: {1} ms)'.format(elapsed, budget))
+            fits = False
+    return fits
+
+
+def compare(results, baseline, threshold):
+    """Returns list of names of benchmarks slower than baseline by more than threshold.
+    """
+    regressions = []
+    for name, result in sorted(results.items()):
+        if name not in baseline: continue
+        ratio = result['ops'] / baseline[name]['ops']
+        if ratio < 1 - threshold:
+            regressions.append(name)
+            print('REGRESSION: {0}: {1:.0%} of baseline speed'.format(name, ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='benchmarks for pyversion')
+    parser.add_argument('--size', type=int, default=2000, help='number of versions in every corpus')
+    parser.add_argument('--repeat', type=int, default=5, help='number of runs (best one is taken)')
+    parser.add_argument('--only', nargs='*', help='run only benchmarks with names starting with these prefixes')
+    parser.add_argument('--save', metavar='FILE', help='save results as JSON baseline')
+    parser.add_argument('--compare', metavar='FILE', help='compare results with JSON baseline')
+    parser.add_argument('--threshold', type=float, default=0.2, help='allowed slowdown (0.2 means 20%%)')
+    parser.add_argument('--import-budget', type=float, default=5.0, help='allowed time of `import pyversion` (ms)')
+    args = parser.parse_args(argv)
+
+    version.cacheclear()
+    results = run(args.size, args.repeat, args.only)
+    fits = True
+    if not args.only or any([prefix.startswith('import') for prefix in args.only]):
+        fits = imports(args.repeat, args.import_budget)
+    if args.save:
+        with open(args.save, 'w') as ofstream: json.dump(results, ofstream, indent=2, sort_keys=True)
+    if args.compare and not os.path.isfile(args.compare):
+        print('no baseline in {0}; run with --save to create it'.format(args.compare))
+    elif args.compare:
+        with open(args.compare) as ifstream: baseline = json.load(ifstream)
+        if compare(results, baseline, args.threshold): return 1
+    return 0 if fits else 1
+
+
+if __name__ == '__main__': sys.exit(main())
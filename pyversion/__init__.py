@@ -1,3 +1,20 @@
-from pyversion import version
+"""Submodules are imported on first access (`pyversion.version`, `pyversion.arrays`, ...)
+so `import pyversion` loads nothing but this file.
+"""
+
 
 __version__ = '0.3.1'
+
+submodules = ('version', 'extraction', 'arrays', 'sets', 'index', 'store', 'parallel', 'binary', 'resolver', 'aio',
+              'diff')
+
+
+def __getattr__(name):
+    if name not in submodules: raise AttributeError('module {0!r} has no attribute {1!r}'.format(__name__, name))
+    # importing a submodule sets it as attribute of the package
+    __import__('{0}.{1}'.format(__name__, name))
+    return globals()[name]
+
+
+def __dir__():
+    return sorted(list(globals()) + list(submodules))
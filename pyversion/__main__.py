@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+
+
+"""Command line interface for bulk operations on newline-delimited versions.
+
+    python3 -m pyversion sort [FILE ...]
+    python3 -m pyversion max --min 1.0.0 --but 1.2.0 < versions.txt
+    python3 -m pyversion filter --permissive --invalid skip tags.txt
+
+Lines are read lazily from files (or standard input) and parsed without
+creating Version() objects; only sort keys are kept.
+"""
+
+
+import argparse
+import os
+import sys
+
+from pyversion import version
+from pyversion.version import Matcher, InvalidVersionStringError, InvalidIdentifierError
+
+
+commands = ('sort', 'unique', 'max', 'min', 'filter')
+
+
+def _parser():
+    parser = argparse.ArgumentParser(prog='pyversion', description='sort, deduplicate and filter versions')
+    parser.add_argument('command', choices=commands, help='operation to perform')
+    parser.add_argument('files', nargs='*', help='files to read (standard input if none or -)')
+    parser.add_argument('-p', '--permissive', action='store_true', help='accept non-standard version strings')
+    parser.add_argument('-r', '--reverse', action='store_true', help='sort in descending order')
+    parser.add_argument('-u', '--unique', action='store_true', help='drop versions equal to earlier ones')
+    parser.add_argument('--min', help='minimal version (inclusive)')
+    parser.add_argument('--max', help='maximal version (inclusive)')
+    parser.add_argument('--but', action='append', default=[], help='exclude this version (may be repeated)')
+    parser.add_argument('--invalid', choices=('fail', 'skip'), default='fail',
+                        help='what to do with invalid lines (default: fail)')
+    return parser
+
+
+def keys(lines, strict=True, skip=False, matcher=None):
+    """Yields `(key, line)` tuples for versions in lines.
+    Empty lines are ignored.
+
+    :param skip: skip invalid lines instead of raising InvalidVersionStringError
+    :param matcher: optional Matcher(); versions not matching it are skipped
+    """
+    makekey, accept = version._key, _accept(matcher)
+    for n, line in enumerate(lines):
+        line = line.strip()
+        parts = _parse(line, n, strict, skip) if line else None
+        if parts is None: continue
+        key = makekey(parts[0], parts[1])
+        if accept is None or accept(key): yield (key, line)
+
+
+def _parse(line, n, strict, skip):
+    """Returns `(base, prerelease, build)` tuple or None for skipped invalid line.
+    """
+    try:
+        return version._parser(line, strict)
+    except (InvalidVersionStringError, InvalidIdentifierError) as e:
+        if skip: return None
+        raise InvalidVersionStringError('{0} (line {1})'.format(e, n+1))
+
+
+def _accept(matcher):
+    """Returns function telling whether sort key matches matcher (None if there is no matcher).
+    """
+    if matcher is None: return None
+    low, high, but = matcher._min, matcher._max, matcher._but
+    return lambda key: (low is None or key >= low) and (high is None or key <= high) and key not in but
+
+
+def readlines(files):
+    """Lazily yields lines from files; `-` means standard input.
+    """
+    for path in files:
+        if path == '-':
+            for line in sys.stdin: yield line
+            continue
+        with open(path) as ifstream:
+            for line in ifstream: yield line
+
+
+def unique(pairs):
+    """Yields pairs with keys not seen before.
+    """
+    seen = set()
+    for key, line in pairs:
+        if key in seen: continue
+        seen.add(key)
+        yield (key, line)
+
+
+def run(command, lines, output, strict=True, skip=False, matcher=None, reverse=False, dedupe=False):
+    """Runs command over lines and writes results to output.
+    Returns exit code.
+    """
+    pairs = keys(lines, strict=strict, skip=skip, matcher=matcher)
+    if dedupe or command == 'unique': pairs = unique(pairs)
+    if command in ('max', 'min'): return _extreme(pairs, output, (max if command == 'max' else min))
+    if command in ('sort', 'unique'):
+        pairs = sorted(pairs, key=lambda pair: pair[0], reverse=reverse)
+    for key, line in pairs: output.write(line + '\n')
+    return 0
+
+
+def _extreme(pairs, output, function):
+    """Writes line of the greatest or least key (first one of equal keys) to output.
+    Returns exit code.
+    """
+    best = function(pairs, key=lambda pair: pair[0], default=None)
+    if best is None: return 1
+    output.write(best[1] + '\n')
+    return 0
+
+
+def _matcher(args, strict):
+    """Returns Matcher() built from --min, --max and --but or None if none of them was given.
+    """
+    if not (args.min or args.max or args.but): return None
+    return Matcher(min=args.min, max=args.max, but=args.but, strict=strict)
+
+
+def _silence():
+    """Points standard output at devnull so flushing it at exit does not fail again
+    after the reader closed the pipe.
+    """
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, sys.stdout.fileno())
+
+
+def main(argv=None):
+    args = _parser().parse_args(argv)
+    strict = not args.permissive
+    try:
+        matcher = _matcher(args, strict)
+    except (InvalidVersionStringError, InvalidIdentifierError) as e:
+        sys.stderr.write('pyversion: invalid --min, --max or --but: {0}\n'.format(e))
+        return 2
+    return _execute(args, strict, matcher)
+
+
+def _execute(args, strict, matcher):
+    """Runs command of parsed arguments reporting errors on standard error.
+    Returns exit code.
+    """
+    try:
+        code = run(args.command, readlines(args.files or ['-']), sys.stdout, strict=strict,
+                   skip=(args.invalid == 'skip'), matcher=matcher, reverse=args.reverse, dedupe=args.unique)
+        sys.stdout.flush()
+        return code
+    except InvalidVersionStringError as e:
+        sys.stderr.write('pyversion: {0}\n'.format(e))
+        return 1
+    except BrokenPipeError:
+        # reader (e.g. `head`) has seen enough
+        _silence()
+        return 1
+    except OSError as e:
+        sys.stderr.write('pyversion: {0}: {1}\n'.format(e.filename, e.strerror))
+        return 2
+
+
+if __name__ == '__main__': sys.exit(main())
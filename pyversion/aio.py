@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+
+
+"""This module holds asyncio adapters parsing and matching streams of
+version strings without blocking the event loop.
+
+Strings are consumed from (async or plain) iterables in chunks of `chunksize`.
+Every chunk is either processed in the event loop, which gets control back
+after every chunk, or sent to an executor. At most `prefetch` chunks are being
+processed at once and the source is read only as fast as results are consumed,
+so memory use stays bounded no matter how big the stream is.
+
+    async for v in aio.match(lines, Matcher(min='1.0.0'), skip=True):
+        ...
+"""
+
+
+import asyncio
+import collections
+import functools
+
+from pyversion import version as _version
+from pyversion.version import Version, InvalidVersionStringError, InvalidIdentifierError
+
+
+async def chunks(source, chunksize=100):
+    """Yields lists of at most `chunksize` items of source.
+
+    :param source: async iterable or iterable
+    """
+    if not hasattr(source, '__aiter__'): source = _aiter(source)
+    chunk = []
+    async for item in source:
+        chunk.append(item)
+        if len(chunk) >= chunksize:
+            yield chunk
+            chunk = []
+    if chunk: yield chunk
+
+
+async def _aiter(iterable):
+    """Adapts plain iterable; yields control to the event loop every 100 items.
+    """
+    for n, item in enumerate(iterable):
+        yield item
+        if n % 100 == 99: await asyncio.sleep(0)
+
+
+def _parsechunk(items, strict, bounds=None):
+    """Returns `(parts, error)` where `parts` holds `(base, prerelease, build)` tuples,
+    Version() objects (passed as they were) or None for invalid or not matching items
+    and `error` is `(index, message)` tuple of the first invalid item or None.
+
+    :param bounds: optional `(min key, max key, excluded keys)` tuple of Matcher()
+    """
+    parts, error = [], None
+    for n, item in enumerate(items):
+        try:
+            part = _parseitem(item, strict)
+        except (InvalidVersionStringError, InvalidIdentifierError) as e:
+            part = None
+            if error is None: error = (n, str(e))
+        if part is not None and bounds is not None and not _within(part, bounds): part = None
+        parts.append(part)
+    return (parts, error)
+
+
+def _parseitem(item, strict):
+    if isinstance(item, Version): return item
+    return _version._parser(item, strict)
+
+
+def _within(part, bounds):
+    """Tells whether Version() or `(base, prerelease, build)` tuple is within Matcher() bounds.
+    """
+    low, high, but = bounds
+    key = part.key if isinstance(part, Version) else _version._key(part[0], part[1])
+    return (low is None or key >= low) and (high is None or key <= high) and key not in but
+
+
+def _pipeline(function, source, chunksize, executor, prefetch):
+    """Returns async iterator of `(chunk, result)` tuples for chunks of source in order.
+    """
+    if executor is None: return _inline(function, source, chunksize)
+    return _offload(function, source, chunksize, executor, prefetch)
+
+
+async def _inline(function, source, chunksize):
+    async for chunk in chunks(source, chunksize):
+        yield (chunk, function(chunk))
+        await asyncio.sleep(0)
+
+
+async def _offload(function, source, chunksize, executor, prefetch):
+    loop = asyncio.get_running_loop()
+    pending = collections.deque()
+    try:
+        async for chunk in chunks(source, chunksize):
+            pending.append((chunk, loop.run_in_executor(executor, function, chunk)))
+            if len(pending) >= prefetch: yield await _first(pending)
+        while pending: yield await _first(pending)
+    finally:
+        for chunk, future in pending: future.cancel()
+
+
+async def _first(pending):
+    """Removes first `(chunk, future)` tuple from pending and returns `(chunk, result)`.
+    """
+    chunk, future = pending.popleft()
+    return (chunk, await future)
+
+
+async def _versions(function, source, strict, skip, chunksize, executor, prefetch):
+    make = Version._make
+    async for chunk, (parts, error) in _pipeline(function, source, chunksize, executor, prefetch):
+        # versions before the first invalid string are yielded no matter how the stream is chunked
+        stop = len(chunk) if error is None or skip else error[0]
+        for item, part in zip(chunk[:stop], parts[:stop]):
+            if part is None: continue
+            yield (part if isinstance(part, Version) else make(item, strict, *part))
+        if stop < len(chunk): raise InvalidVersionStringError(error[1])
+
+
+def parse(source, strict=True, skip=False, chunksize=100, executor=None, prefetch=2):
+    """Asynchronously yields Version() objects parsed from source.
+    Versions are created from parsed parts and are not interned.
+
+    :param source: async iterable or iterable of version strings (Version() objects are passed as they are)
+    :param strict: tells whether to use strict or permissive version strings
+    :param skip: skip invalid strings instead of raising InvalidVersionStringError
+    :param chunksize: number of strings processed at once; bigger chunks mean fewer switches
+        but longer stalls of the event loop (executors work best with chunks of thousands of strings)
+    :param executor: optional `concurrent.futures` executor chunks are processed in;
+        None means they are processed in the event loop, which gets control back after every chunk
+    :param prefetch: maximal number of chunks being processed in executor at once
+    """
+    function = functools.partial(_parsechunk, strict=strict)
+    return _versions(function, source, strict, skip, chunksize, executor, max(1, prefetch))
+
+
+def match(source, matcher, skip=False, chunksize=100, executor=None, prefetch=2):
+    """Asynchronously yields versions from source matching given Matcher().
+    Strings are parsed with strictness of the matcher; versions are matched
+    together with parsing (in executor if one is given).
+    See `parse()` for description of parameters.
+    """
+    function = functools.partial(_parsechunk, strict=matcher.strict,
+                                 bounds=(matcher._min, matcher._max, matcher._but))
+    return _versions(function, source, matcher.strict, skip, chunksize, executor, max(1, prefetch))
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+
+
+"""This module holds NumPy-backed arrays of versions for
+bulk comparison and sorting.
+
+NumPy is an optional dependency; it is only required when
+VersionArray() objects are created.
+"""
+
+
+import bisect
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from pyversion.version import Version
+
+
+# components above this do not fit in int64 columns
+_int64max = 2**63 - 1
+
+
+def _basematrix(bases, width):
+    """Returns matrix of bases padded with `-1` to at least given width.
+    Columns are int64 unless a component does not fit in it; then Python integers
+    are stored in object matrix so comparisons stay exact.
+    """
+    width = max([len(base) for base in bases] + [width])
+    dtype = numpy.int64 if all([n <= _int64max for base in bases for n in base]) else object
+    matrix = numpy.full((len(bases), width), -1, dtype=dtype)
+    for i, base in enumerate(bases): matrix[i, :len(base)] = base
+    return matrix
+
+
+class VersionArray():
+    """Array of versions packed into integer columns.
+
+    Base components are stored in `(n, width)` matrix padded with `-1` (so `1.0` < `1.0.0`
+    just like in Comparison()); the matrix holds Python integers (`dtype=object`, slower)
+    only when some component does not fit in int64 and everything after base (release flag and prerelease
+    identifiers) is stored as rank in a sorted table of distinct prereleases.
+    Comparisons are vectorised and return boolean arrays.
+    """
+    def __init__(self, versions, strict=True):
+        """:param versions: iterable of Version() objects or version strings
+        :param strict: strictness used for strings
+        """
+        if numpy is None: raise ImportError('VersionArray requires numpy')
+        versions = [(v if isinstance(v, Version) else Version(v, strict=strict)) for v in versions]
+        self.base = _basematrix([v.key[0] for v in versions], 1)
+        self._table = sorted(set([v.key[1:] for v in versions]))
+        index = dict([(tail, i) for i, tail in enumerate(self._table)])
+        self.rank = numpy.array([index[v.key[1:]] for v in versions], dtype=numpy.int64)
+        self.strict = strict
+        self._versions = versions
+
+    @classmethod
+    def _fromparts(cls, versions, base, rank, table, strict):
+        array = object.__new__(cls)
+        array._versions, array.base, array.rank, array._table, array.strict = versions, base, rank, table, strict
+        return array
+
+    def __len__(self):
+        return len(self._versions)
+
+    def __iter__(self):
+        return iter(self._versions)
+
+    def __getitem__(self, n):
+        return self._versions[n]
+
+    def __repr__(self):
+        return 'VersionArray([{0}])'.format(', '.join([repr(v) for v in self._versions]))
+
+    def _columns(self, width):
+        """Returns base padded with `-1` to given width.
+        """
+        if width <= self.base.shape[1]: return self.base
+        padding = numpy.full((self.base.shape[0], width - self.base.shape[1]), -1, dtype=self.base.dtype)
+        return numpy.hstack((self.base, padding))
+
+    def _operands(self, other):
+        """Returns `(base, rank, otherbase, otherrank)` with both sides padded to the same
+        width and ranks doubled into common scale.
+        """
+        if isinstance(other, VersionArray):
+            table = sorted(set(self._table) | set(other._table))
+            index = dict([(tail, 2*i) for i, tail in enumerate(table)])
+            rank = numpy.array([index[t] for t in self._table], dtype=numpy.int64)[self.rank]
+            otherrank = numpy.array([index[t] for t in other._table], dtype=numpy.int64)[other.rank]
+            width = max(self.base.shape[1], other.base.shape[1])
+            return (self._columns(width), rank, other._columns(width), otherrank)
+        if not isinstance(other, Version): other = Version(other, strict=self.strict)
+        base, tail = other.key[0], other.key[1:]
+        otherbase = _basematrix([base], self.base.shape[1])
+        width = otherbase.shape[1]
+        n = bisect.bisect_left(self._table, tail)
+        # versions missing from the table fall between ranks
+        otherrank = 2*n if n < len(self._table) and self._table[n] == tail else 2*n - 1
+        return (self._columns(width), 2*self.rank, otherbase, numpy.int64(otherrank))
+
+    def compare(self, other):
+        """Returns array of `-1`, `0` and `1` (three-way comparison of every element with other).
+
+        :param other: Version() object, version string or VersionArray() of the same length
+        """
+        base, rank, otherbase, otherrank = self._operands(other)
+        shape = numpy.broadcast(base[:, 0], otherbase[:, 0]).shape
+        result = numpy.zeros(shape, dtype=numpy.int8)
+        undecided = numpy.ones(shape, dtype=bool)
+        for column in range(base.shape[1]):
+            first, second = base[:, column], otherbase[:, column]
+            diff = (first > second).astype(numpy.int8) - (first < second).astype(numpy.int8)
+            result = numpy.where(undecided, diff, result)
+            undecided &= diff == 0
+        diff = (rank > otherrank).astype(numpy.int8) - (rank < otherrank).astype(numpy.int8)
+        return numpy.where(undecided, diff, result)
+
+    def lt(self, other):
+        return self.compare(other) < 0
+
+    def le(self, other):
+        return self.compare(other) <= 0
+
+    def eq(self, other):
+        return self.compare(other) == 0
+
+    def gt(self, other):
+        return self.compare(other) > 0
+
+    def ge(self, other):
+        return self.compare(other) >= 0
+
+    __lt__, __le__, __gt__, __ge__ = lt, le, gt, ge
+
+    def argsort(self):
+        """Returns indices that sort the array (stable, build metadata is ignored).
+        """
+        columns = [self.rank] + [self.base[:, i] for i in reversed(range(self.base.shape[1]))]
+        return numpy.lexsort(columns)
+
+    def sort(self):
+        """Returns sorted copy of the array.
+        """
+        return self._take(self.argsort())
+
+    def _take(self, indices):
+        return VersionArray._fromparts([self._versions[i] for i in indices], self.base[indices],
+                                       self.rank[indices], self._table, self.strict)
+
+    def _extreme(self, select):
+        """Narrows candidates column by column and returns first remaining version.
+        """
+        if not len(self): raise ValueError('empty VersionArray')
+        candidates = numpy.arange(len(self))
+        for values in [self.base[:, i] for i in range(self.base.shape[1])] + [self.rank]:
+            values = values[candidates]
+            candidates = candidates[values == select(values)]
+        return self._versions[candidates[0]]
+
+    def min(self):
+        return self._extreme(numpy.min)
+
+    def max(self):
+        return self._extreme(numpy.max)
+
+    def unique(self):
+        """Returns sorted array of distinct versions (first of versions differing only
+        in build metadata is kept).
+        """
+        order = self.argsort()
+        base, rank = self.base[order], self.rank[order]
+        distinct = numpy.ones(len(order), dtype=bool)
+        distinct[1:] = (base[1:] != base[:-1]).any(axis=1) | (rank[1:] != rank[:-1])
+        return self._take(order[distinct])
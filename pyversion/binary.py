@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+
+
+"""This module holds compact binary encoding of versions and
+catalogues (collections) of versions.
+
+Catalogue layout (all integers are unsigned LEB128 varints unless noted):
+
+    magic       b'PYV1'
+    flags       1 byte: 1 = versions are sorted, 2 = build metadata is stored,
+                4 = permissive (strings looked up in catalogue are parsed permissively)
+    count       number of versions
+    identifiers number of entries in identifier table, then every entry as length + ASCII bytes
+    offsets     count * uint32 (little endian) offsets of entries, relative to first entry
+    entries     (len(base) << 1 | strict), base components,
+                number of prerelease identifiers, every one as (integer << 1)
+                or (table index << 1 | 1), then build metadata as length + ASCII bytes
+
+Catalogues are decoded lazily: loading reads only header and identifier table,
+versions are decoded when accessed.
+
+Sortable keys (`sortkey()`) are byte strings ordered just like versions when compared
+byte by byte (memcmp, SQLite BLOB columns, sorted columnar files):
+
+    base        every component as 0x02, length, big-endian bytes; then 0x01
+    release     0x01 for prereleases, 0x02 for releases
+    prerelease  every string identifier as 0x02, ASCII bytes, 0x00 and every
+                integer identifier as 0x03, length, big-endian bytes; then 0x01
+
+Build metadata is not part of keys (it does not affect order).
+"""
+
+
+import bisect
+import mmap
+import struct
+
+from pyversion.version import Version, _asversion, _format
+
+
+magic = b'PYV1'
+SORTED, BUILD, PERMISSIVE = 1, 2, 4
+_offset = struct.Struct('<I')
+
+
+class CatalogueError(Exception):
+    pass
+
+
+def _writevarint(out, n):
+    while n > 0x7f:
+        out.append((n & 0x7f) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _readvarint(buffer, position):
+    """Returns `(value, position after value)`.
+    """
+    result, shift = 0, 0
+    while True:
+        byte = buffer[position]
+        position += 1
+        result |= (byte & 0x7f) << shift
+        if byte < 0x80: return (result, position)
+        shift += 7
+
+
+def dumps(versions, sort=False, build=True, strict=True):
+    """Returns catalogue of versions as bytes.
+
+    :param versions: iterable of Version() objects or version strings
+    :param sort: sort versions before encoding (catalogue is marked as sorted)
+    :param build: store build metadata
+    :param strict: strictness used for version strings
+    """
+    versions = [_asversion(v, strict) for v in versions]
+    if sort: versions.sort(key=lambda v: v.key)
+    table = sorted(set([i for v in versions for i in v.key[2] if i[0] == 0]))
+    index = dict([(identifier, n) for n, (kind, identifier) in enumerate(table)])
+    out, entries, offsets = bytearray(magic), bytearray(), bytearray()
+    permissive = not strict or not all([v.strict for v in versions])
+    out.append((SORTED if sort else 0) | (BUILD if build else 0) | (PERMISSIVE if permissive else 0))
+    _writevarint(out, len(versions))
+    _writevarint(out, len(table))
+    for kind, identifier in table:
+        _writevarint(out, len(identifier))
+        out.extend(identifier.encode('ascii'))
+    for version in versions:
+        offsets.extend(_offset.pack(len(entries)))
+        _writeentry(entries, version, index, build)
+    return bytes(out + offsets + entries)
+
+
+def _writeentry(out, version, index, build):
+    """Writes catalogue entry of version.
+
+    :param index: dictionary mapping string identifiers to their positions in identifier table
+    """
+    base, prerelease = version.key[0], version.prerelease
+    _writevarint(out, len(base) << 1 | bool(version.strict))
+    for n in base: _writevarint(out, n)
+    _writevarint(out, len(prerelease))
+    for i in prerelease: _writevarint(out, (i << 1) if type(i) is int else (index[i] << 1 | 1))
+    if build:
+        _writevarint(out, len(version.build))
+        out.extend(version.build.encode('ascii'))
+
+
+class Catalogue():
+    """Lazily decoded catalogue of versions backed by a buffer
+    (bytes, memoryview or mmap).
+
+    Sorted catalogues support bisection (`in` operator, `index()`) without
+    decoding every version. In unsorted catalogues the first `in` test decodes
+    every version and keeps a set of their keys (O(n) time and memory once).
+    Version strings are parsed with strictness of the catalogue (permissive if it
+    was dumped with `strict=False` or holds permissive versions).
+    """
+    def __init__(self, buffer):
+        self._buffer = memoryview(buffer)
+        if bytes(self._buffer[:4]) != magic: raise CatalogueError('not a version catalogue')
+        self.flags = self._buffer[4]
+        self._keys = None
+        self._count, position = _readvarint(self._buffer, 5)
+        size, position = _readvarint(self._buffer, position)
+        self._table = []
+        for n in range(size):
+            length, position = _readvarint(self._buffer, position)
+            self._table.append(bytes(self._buffer[position:position+length]).decode('ascii'))
+            position += length
+        self._offsets = position
+        self._entries = position + _offset.size * self._count
+
+    @property
+    def sorted(self):
+        return bool(self.flags & SORTED)
+
+    @property
+    def strict(self):
+        return not self.flags & PERMISSIVE
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        for n in range(self._count): yield self[n]
+
+    def __getitem__(self, n):
+        if n < 0: n += self._count
+        if not 0 <= n < self._count: raise IndexError('catalogue index out of range')
+        return self._decode(self._entries + _offset.unpack_from(self._buffer, self._offsets + n*_offset.size)[0])
+
+    def _decode(self, position):
+        buffer = self._buffer
+        header, position = _readvarint(buffer, position)
+        base = []
+        for n in range(header >> 1):
+            component, position = _readvarint(buffer, position)
+            base.append(component)
+        count, position = _readvarint(buffer, position)
+        prerelease = []
+        for n in range(count):
+            value, position = _readvarint(buffer, position)
+            prerelease.append(self._table[value >> 1] if value & 1 else value >> 1)
+        build = ''
+        if self.flags & BUILD:
+            length, position = _readvarint(buffer, position)
+            build = bytes(buffer[position:position+length]).decode('ascii')
+        base, prerelease = tuple(base), tuple(prerelease)
+        return Version._make(_format(base, prerelease, build), bool(header & 1), base, prerelease, build)
+
+    def index(self, version, strict=None):
+        """Returns index of first version equal to given one (build metadata is ignored).
+        Catalogue must be sorted. Raises ValueError if version is not found.
+
+        :param strict: strictness used for version strings (None means strictness of the catalogue)
+        """
+        if not self.sorted: raise CatalogueError('catalogue is not sorted')
+        key = _asversion(version, self.strict if strict is None else strict).key
+        n = bisect.bisect_left(_Keys(self), key)
+        if n < self._count and self[n].key == key: return n
+        raise ValueError('version not in catalogue: {0}'.format(version))
+
+    def __contains__(self, version):
+        if not self.sorted:
+            if self._keys is None: self._keys = set([v.key for v in self])
+            return _asversion(version, self.strict).key in self._keys
+        try: self.index(version)
+        except ValueError: return False
+        return True
+
+
+class _Keys():
+    """Sequence of keys of catalogue versions used for bisection.
+    """
+    def __init__(self, catalogue):
+        self.catalogue = catalogue
+
+    def __len__(self):
+        return len(self.catalogue)
+
+    def __getitem__(self, n):
+        return self.catalogue[n].key
+
+
+def loads(buffer):
+    """Returns Catalogue() backed by given buffer (not copied).
+    """
+    return Catalogue(buffer)
+
+
+def dump(versions, path, **options):
+    """Writes catalogue to file. See `dumps()` for options.
+    """
+    with open(path, 'wb') as ofstream: ofstream.write(dumps(versions, **options))
+
+
+def load(path):
+    """Returns Catalogue() backed by memory-mapped file.
+    """
+    with open(path, 'rb') as ifstream:
+        return Catalogue(mmap.mmap(ifstream.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+def encode(version, strict=True):
+    """Returns single version encoded as one-element catalogue.
+    """
+    return dumps([version], strict=strict)
+
+
+def decode(buffer):
+    """Returns version encoded with `encode()`.
+    """
+    return Catalogue(buffer)[0]
+
+
+def _writeinteger(out, n):
+    length = (n.bit_length() + 7) // 8
+    if length > 0xff: raise ValueError('integer too big for sortable key: {0}'.format(n))
+    out.append(length)
+    out.extend(n.to_bytes(length, 'big'))
+
+
+def sortkey(version, strict=True):
+    """Returns order-preserving byte string for version: keys of two versions compare
+    (as bytes) just like the versions do.
+
+    :param version: Version() object or version string
+    :param strict: strictness used for version strings
+    """
+    base, release, identifiers = _asversion(version, strict).key
+    out = bytearray()
+    for n in base:
+        out.append(2)
+        _writeinteger(out, n)
+    out.append(1)
+    out.append(2 if release else 1)
+    for kind, identifier in identifiers:
+        if kind:
+            out.append(3)
+            _writeinteger(out, identifier)
+        else:
+            out.append(2)
+            out.extend(identifier.encode('ascii'))
+            out.append(0)
+    if not release: out.append(1)
+    return bytes(out)
+
+
+def _readinteger(key, position):
+    """Returns `(integer, position after it)` for integer written with `_writeinteger()`.
+    """
+    length = key[position]
+    if position + 1 + length > len(key): raise IndexError('truncated integer')
+    return (int.from_bytes(key[position+1:position+1+length], 'big'), position + 1 + length)
+
+
+def _readbase(key):
+    """Returns `(base, position after base terminator)`.
+    """
+    base, position = [], 0
+    while key[position] == 2:
+        n, position = _readinteger(key, position + 1)
+        base.append(n)
+    if key[position] != 1 or not base: raise ValueError('invalid base')
+    return (base, position + 1)
+
+
+def _readidentifier(key, position):
+    """Returns `(identifier, position after it)`.
+    """
+    if key[position] == 3: return _readinteger(key, position + 1)
+    if key[position] != 2: raise ValueError('invalid identifier')
+    end = key.index(0, position)
+    return (bytes(key[position+1:end]).decode('ascii'), end + 1)
+
+
+def _readprerelease(key, position):
+    """Returns `(identifiers, position after prerelease)` reading release flag
+    and prerelease identifiers (empty for releases).
+    """
+    if key[position] == 2: return ([], position + 1)
+    if key[position] != 1: raise ValueError('invalid release flag')
+    prerelease, position = [], position + 1
+    while key[position] != 1:
+        identifier, position = _readidentifier(key, position)
+        prerelease.append(identifier)
+    if not prerelease: raise ValueError('empty prerelease')
+    return (prerelease, position + 1)
+
+
+def fromsortkey(key, strict=None):
+    """Returns Version() object (without build metadata) encoded with `sortkey()`.
+
+    :param strict: strictness of returned version (None means strict if base has three components)
+    """
+    try:
+        base, position = _readbase(key)
+        prerelease, position = _readprerelease(key, position)
+    except (IndexError, ValueError):
+        raise CatalogueError('invalid sortable key')
+    if position != len(key): raise CatalogueError('invalid sortable key')
+    if strict is None: strict = len(base) == 3
+    base, prerelease = tuple(base), tuple(prerelease)
+    return Version._make(_format(base, prerelease, ''), strict, base, prerelease, '')
+
+
+# greater than key of any version
+_highest = b'\xff'
+
+
+def bounds(matcher):
+    """Returns `(low, high)` tuple of sortable keys such that every version matching the
+    Matcher() has key in `[low, high]` range (inclusive), e.g. for
+    `WHERE key BETWEEN ? AND ?` queries.
+    Versions excluded with `but` are not taken into account; their keys are
+    `[sortkey(v) for v in matcher.but]`.
+    """
+    low = b'' if matcher.min is None else sortkey(matcher.min)
+    high = _highest if matcher.max is None else sortkey(matcher.max)
+    return (low, high)
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+
+
+"""This module holds logic code for finding differences between two
+sorted collections (snapshots) of versions.
+
+Both inputs are read once, in step, like in merge sort so they may be
+streams (e.g. lines of sorted files or `pyversion.binary` catalogues) too big
+to fit in memory; only versions of one sort key are held at a time.
+"""
+
+
+import collections
+
+from pyversion.version import Version
+
+
+ADDED, REMOVED, CHANGED = 'added', 'removed', 'changed'
+
+
+def _versions(items, strict):
+    """Yields Version() objects for items; strings are stripped and empty ones skipped.
+    """
+    for item in items:
+        if isinstance(item, Version):
+            yield item
+            continue
+        item = item.strip()
+        if item: yield Version._parse(item, strict)
+
+
+def _groups(versions, strict):
+    """Yields `(key, versions)` tuples for runs of equal versions.
+    Raises ValueError if versions are not sorted.
+
+    :param versions: sorted iterable of Version() objects or version strings (empty strings are skipped)
+    """
+    key, group = None, []
+    for version in _versions(versions, strict):
+        if group and version.key != key:
+            if version.key < key: raise ValueError('versions are not sorted: {0} after {1}'.format(version, group[-1]))
+            yield (key, group)
+            group = []
+        key = version.key
+        group.append(version)
+    if group: yield (key, group)
+
+
+def _diffgroup(old, new):
+    """Yields changes between versions of equal keys.
+    Versions with the same build metadata are unchanged (as many of them as both sides have);
+    the rest are paired as changed in input order and leftovers are removed or added.
+    """
+    common = collections.Counter([v.build for v in old]) & collections.Counter([v.build for v in new])
+    old, new = _without(old, common), _without(new, common)
+    for a, b in zip(old, new): yield (CHANGED, a, b)
+    for a in old[len(new):]: yield (REMOVED, a, None)
+    for b in new[len(old):]: yield (ADDED, None, b)
+
+
+def _without(versions, counts):
+    """Returns versions without first `counts[build]` ones of every build metadata.
+    """
+    counts, left = collections.Counter(counts), []
+    for v in versions:
+        if counts[v.build] > 0: counts[v.build] -= 1
+        else: left.append(v)
+    return left
+
+
+def diff(old, new, strict=True):
+    """Lazily yields `(change, old version, new version)` tuples where change is
+    `ADDED` (old version is None), `REMOVED` (new version is None) or `CHANGED`
+    (versions are equal but have different build metadata), in order of versions.
+
+    :param old: sorted iterable of Version() objects or version strings
+    :param new: sorted iterable of Version() objects or version strings
+    :param strict: strictness used for version strings
+    """
+    old, new = _groups(old, strict), _groups(new, strict)
+    a, b = next(old, None), next(new, None)
+    while a is not None and b is not None:
+        if a[0] < b[0]:
+            changes, a = _changes(REMOVED, a[1]), next(old, None)
+        elif a[0] > b[0]:
+            changes, b = _changes(ADDED, b[1]), next(new, None)
+        else:
+            changes, a, b = _diffgroup(a[1], b[1]), next(old, None), next(new, None)
+        yield from changes
+    yield from _drain(a, old, REMOVED)
+    yield from _drain(b, new, ADDED)
+
+
+def _changes(change, versions):
+    return [((change, v, None) if change == REMOVED else (change, None, v)) for v in versions]
+
+
+def _drain(group, groups, change):
+    """Yields changes for given group (may be None) and the rest of groups
+    left after the other input ended.
+    """
+    while group is not None:
+        yield from _changes(change, group[1])
+        group = next(groups, None)
+
+
+def difffiles(old, new, strict=True):
+    """Yields changes between two files with sorted, newline-delimited versions.
+    See `diff()`.
+
+    :param old: path to old snapshot
+    :param new: path to new snapshot
+    """
+    with open(old) as a, open(new) as b:
+        for change in diff(a, b, strict=strict): yield change
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+
+
+"""This module holds logic code for extracting every version mentioned
+in large texts (build logs, changelogs) in bounded memory.
+
+Unlike `pyversion.version.extract()` versions do not have to span the whole string.
+Versions are found on word boundaries: `v1.2.3`, `pkg-1.2.3.tar.gz` and `(1.2.3)` all
+mention `1.2.3` but `x1.2.3` and `1.2.3.4` (in strict mode) do not.
+"""
+
+
+import functools
+import mmap
+import os
+import re
+
+from pyversion.version import Version, base_regexp, permissive_regexp
+
+
+# version may be prefixed with `v` but not glued to other word or version characters
+_before = '(?<![0-9A-Za-z.])[vV]?'
+# trailing dot is fine (end of sentence, `.tar.gz`) but not when followed by a digit
+_after = '(?![0-9A-Za-z+-]|\\.[0-9])'
+# versions (and text the pattern looks at after them) never extend past this character;
+# the pattern backtracks so only a match followed by it somewhere in the buffer is final
+_terminator = '[^0-9A-Za-z.+-]'
+
+
+@functools.lru_cache(maxsize=2)
+def _terminatorpattern(binary):
+    return re.compile(_terminator.encode('ascii') if binary else _terminator)
+
+
+@functools.lru_cache(maxsize=4)
+def _pattern(strict, binary):
+    """Returns compiled unanchored pattern with `version` group.
+    """
+    source = '{0}(?P<version>{1}){2}'.format(_before, (base_regexp if strict else permissive_regexp), _after)
+    if binary: source = source.encode('ascii')
+    return re.compile(source)
+
+
+def _version(match, strict):
+    string = match.group('version')
+    if not isinstance(string, str): string = string.decode('ascii')
+    return Version(string, strict=strict)
+
+
+def _bufferiter(buffer, strict):
+    """Yields `(offset, version)` tuples from bytes-like object (bytes, mmap, memoryview).
+    """
+    for match in _pattern(strict, True).finditer(buffer):
+        yield (match.start('version'), _version(match, strict))
+
+
+def _pathiter(path, strict):
+    """Yields `(offset, version)` tuples from file under given path.
+    File is memory-mapped so only pages that are being searched are held in memory.
+    """
+    with open(path, 'rb') as ifstream:
+        if not os.fstat(ifstream.fileno()).st_size: return
+        with mmap.mmap(ifstream.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            for item in _bufferiter(buffer, strict): yield item
+
+
+def _streamiter(stream, strict, chunksize, overlap):
+    """Yields `(offset, version)` tuples from text or binary stream read in chunks.
+
+    Matches not followed by a terminator (a character that cannot be part of a version)
+    are deferred until next chunk is read so versions split between chunks are found whole.
+    At most `overlap` characters are carried between chunks which means versions
+    in runs of version characters (`[0-9A-Za-z.+-]`) longer than that may be missed.
+    """
+    buffer, offset, position, regexp, eof = None, 0, 0, None, False
+    while not eof:
+        chunk = stream.read(chunksize)
+        eof = not chunk
+        if buffer is None:
+            binary = not isinstance(chunk, str)
+            buffer, regexp, terminator = chunk, _pattern(strict, binary), _terminatorpattern(binary)
+        else:
+            buffer += chunk
+        for match in regexp.finditer(buffer, position):
+            if not eof and terminator.search(buffer, match.end()) is None: break
+            yield (offset + match.start('version'), _version(match, strict))
+            position = match.end()
+        # keep one character before search position for lookbehind
+        cut = max(position, len(buffer) - overlap) - 1
+        if cut > 0:
+            buffer, offset, position = buffer[cut:], offset + cut, 1
+
+
+def finditer(source, strict=True, chunksize=65536, overlap=1024):
+    """Lazily yields `(offset, version)` tuples for every version mentioned in source.
+    Offsets are counted in characters for text streams and in bytes otherwise.
+
+    :param source: path (memory-mapped), bytes-like object or text/binary file object
+    :param strict: tells whether to look for strict or permissive version strings
+    :param chunksize: number of characters (or bytes) read from file objects at once
+    :param overlap: maximal length of a run of version characters found across chunk boundary
+    """
+    if isinstance(source, (str, os.PathLike)): return _pathiter(source, strict)
+    if isinstance(source, (bytes, bytearray, memoryview, mmap.mmap)): return _bufferiter(source, strict)
+    return _streamiter(source, strict, chunksize, max(overlap, 1))
+
+
+def extractall(source, strict=True, **options):
+    """Returns list of all versions mentioned in source.
+    See `finditer()` for description of parameters.
+    """
+    return [version for offset, version in finditer(source, strict, **options)]
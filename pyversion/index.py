@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+
+
+"""This module holds logic code for finding which of many Matcher()
+ranges contain given version.
+"""
+
+
+import heapq
+import itertools
+
+from pyversion.version import _asversion
+
+
+# sort keys lower and higher than key of any version (used for unbounded ranges)
+_lowest = ()
+_highest = ((float('inf'),),)
+
+
+class _Node():
+    """Node of centered interval tree.
+    Holds intervals containing `center` sorted by lower bound (ascending)
+    and by upper bound (descending).
+    """
+    __slots__ = ('center', 'bylow', 'byhigh', 'left', 'right')
+
+    def __init__(self, entries):
+        endpoints = sorted([e[0] for e in entries] + [e[1] for e in entries])
+        self.center = center = endpoints[len(endpoints) // 2]
+        left = [e for e in entries if e[1] < center]
+        right = [e for e in entries if e[0] > center]
+        here = [e for e in entries if e[0] <= center <= e[1]]
+        self.bylow = sorted(here, key=lambda e: e[0])
+        self.byhigh = sorted(here, key=lambda e: e[1], reverse=True)
+        self.left = _Node(left) if left else None
+        self.right = _Node(right) if right else None
+
+
+class MatcherIndex():
+    """Index of Matcher() ranges answering "which matchers contain this version"
+    in `O(log n + k)`.
+
+    Matchers are kept in a centered interval tree. Added matchers wait in a small
+    buffer and removed ones are only marked; the tree is rebuilt when either grows
+    too big, so inserts and deletes are cheap on average.
+    Exclusions (`but`) of matchers are checked for every candidate.
+    """
+    def __init__(self, matchers=()):
+        """:param matchers: iterable of Matcher() objects
+        """
+        self._entries = {}
+        self._serial = itertools.count()
+        self._tree, self._pending, self._removed = None, [], set()
+        for matcher in matchers: self.add(matcher, rebuild=False)
+        self._rebuild()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __iter__(self):
+        return iter([entry[3] for entry in self._entries.values()])
+
+    def __contains__(self, matcher):
+        return id(matcher) in self._entries
+
+    def add(self, matcher, rebuild=True):
+        """Adds matcher to the index.
+        Matchers with `min` greater than `max` match nothing and never get into the tree.
+
+        :param matcher: Matcher() object
+        :param rebuild: allow rebuilding the tree if too many matchers are waiting in the buffer
+        """
+        if id(matcher) in self._entries: return
+        low = _lowest if matcher.min is None else matcher.min.key
+        high = _highest if matcher.max is None else matcher.max.key
+        entry = (low, high, next(self._serial), matcher)
+        self._entries[id(matcher)] = entry
+        if low > high: return
+        self._pending.append(entry)
+        if rebuild and len(self._pending) > max(64, int(len(self._entries) ** 0.5)): self._rebuild()
+
+    def remove(self, matcher):
+        """Removes matcher from the index.
+        Raises KeyError if matcher is not in the index.
+        """
+        entry = self._entries.pop(id(matcher))
+        if entry in self._pending: self._pending.remove(entry)
+        else: self._removed.add(entry[2])
+        if len(self._removed) > len(self._entries): self._rebuild()
+
+    def _rebuild(self):
+        entries = [e for e in self._entries.values() if e[0] <= e[1]]
+        self._tree = _Node(entries) if entries else None
+        self._pending, self._removed = [], set()
+
+    def _candidates(self, key):
+        """Yields entries whose ranges contain given key (exclusions are not checked).
+        """
+        node = self._tree
+        while node is not None:
+            if key < node.center:
+                yield from itertools.takewhile(lambda entry: entry[0] <= key, node.bylow)
+                node = node.left
+            else:
+                yield from itertools.takewhile(lambda entry: entry[1] >= key, node.byhigh)
+                node = node.right
+        yield from [entry for entry in self._pending if entry[0] <= key <= entry[1]]
+
+    def query(self, version, strict=True):
+        """Returns list of matchers that match given version.
+
+        :param version: version string or Version() object
+        :param strict: strictness used for version strings
+        """
+        key, removed = _asversion(version, strict).key, self._removed
+        return [e[3] for e in self._candidates(key) if e[2] not in removed and key not in e[3]._but]
+
+    def querymany(self, versions, strict=True):
+        """Returns list of lists of matchers (one list for every given version).
+
+        Versions are sorted and swept against matchers sorted by lower bound, keeping
+        active matchers in a heap ordered by upper bound; this is faster than
+        querying versions one by one when there are many of them.
+
+        :param versions: iterable of version strings or Version() objects
+        :param strict: strictness used for version strings
+        """
+        keys = [_asversion(v, strict).key for v in versions]
+        entries = sorted([e for e in self._entries.values() if e[0] <= e[1]])
+        results, active, ending, n = [None] * len(keys), {}, [], 0
+        for i in sorted(range(len(keys)), key=keys.__getitem__):
+            key = keys[i]
+            while n < len(entries) and entries[n][0] <= key:
+                active[entries[n][2]] = entries[n]
+                heapq.heappush(ending, (entries[n][1], entries[n][2]))
+                n += 1
+            while ending and ending[0][0] < key: active.pop(heapq.heappop(ending)[1])
+            results[i] = [e[3] for e in sorted(active.values(), key=lambda e: e[2]) if key not in e[3]._but]
+        return results
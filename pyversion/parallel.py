@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+
+
+"""This module holds logic code for parsing, validating and sorting
+big batches of version strings in a pool of processes.
+
+Workers send back plain tuples (parsed parts or sort keys) instead of
+pickled Version() objects; the calling process builds versions from them
+without validating the strings again.
+Small inputs (below `threshold` strings) or `workers=1` are handled in the
+calling process.
+"""
+
+
+import concurrent.futures
+import heapq
+
+from pyversion import version as _version
+from pyversion.version import Version, InvalidVersionStringError, InvalidIdentifierError
+
+
+def _chunks(strings, chunksize):
+    for start in range(0, len(strings), chunksize):
+        yield (strings[start:start+chunksize], start)
+
+
+def _parsechunk(strings, strict, start):
+    """Returns `(parts, errors)` where `parts` holds `(base, prerelease, build)` tuples
+    (or None for invalid strings).
+    """
+    parts, errors, parser = [], [], _version._parser
+    for i, string in enumerate(strings):
+        try:
+            parts.append(parser(string, strict))
+        except (InvalidVersionStringError, InvalidIdentifierError) as e:
+            parts.append(None)
+            errors.append((start + i, string, str(e)))
+    return (parts, errors)
+
+
+def _validchunk(strings, strict, start):
+    """Returns indexes of invalid strings.
+    """
+    return [start + i for i, string in enumerate(strings) if not _version.valid(string, strict)]
+
+
+def _sortchunk(strings, strict, start):
+    """Returns `(run, errors)` where `run` is sorted list of `(key, index, build)` tuples.
+    """
+    parts, errors = _parsechunk(strings, strict, start)
+    run = [(_version._key(part[0], part[1]), start + i, part[2]) for i, part in enumerate(parts) if part is not None]
+    run.sort()
+    return (run, errors)
+
+
+def _run(function, strings, strict, workers, chunksize, threshold, executor):
+    """Applies function to chunks of strings and returns list of results
+    (in chunk order).
+    """
+    if executor is None and (workers == 1 or len(strings) < threshold):
+        return [function(strings, strict, 0)]
+    chunks = list(_chunks(strings, chunksize))
+    arguments = ([c[0] for c in chunks], [strict] * len(chunks), [c[1] for c in chunks])
+    if executor is not None: return list(executor.map(function, *arguments))
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(function, *arguments))
+
+
+def parse(strings, strict=True, workers=None, chunksize=10000, threshold=50000, executor=None):
+    """Parses version strings in parallel.
+    Returns `(versions, errors)` tuple just like `Version.parse_many()`.
+
+    :param strings: iterable of version strings
+    :param strict: tells whether to use strict or permissive version strings
+    :param workers: number of worker processes (None means number of CPUs)
+    :param chunksize: number of strings sent to a worker at once
+    :param threshold: inputs shorter than this are parsed in the calling process
+    :param executor: optional `concurrent.futures` executor to use instead of new process pool
+    """
+    strings = list(strings)
+    versions, errors, make, i = [], [], Version._make, 0
+    for parts, chunkerrors in _run(_parsechunk, strings, strict, workers, chunksize, threshold, executor):
+        for part in parts:
+            if part is not None: versions.append(make(strings[i], strict, *part))
+            i += 1
+        errors.extend(chunkerrors)
+    return (versions, errors)
+
+
+def validate(strings, strict=True, workers=None, chunksize=10000, threshold=50000, executor=None):
+    """Returns list of booleans telling which strings are valid version strings.
+    See `parse()` for description of parameters.
+    """
+    strings = list(strings)
+    result = [True] * len(strings)
+    for invalid in _run(_validchunk, strings, strict, workers, chunksize, threshold, executor):
+        for i in invalid: result[i] = False
+    return result
+
+
+def sort(strings, strict=True, workers=None, chunksize=10000, threshold=50000, executor=None):
+    """Parses and sorts version strings in parallel.
+    Every worker sorts its chunk and sorted runs are merged in the calling process.
+    Returns `(versions, errors)` tuple with versions sorted (ties keep input order).
+    See `parse()` for description of parameters.
+    """
+    strings = list(strings)
+    results = _run(_sortchunk, strings, strict, workers, chunksize, threshold, executor)
+    versions, errors, make = [], [], Version._make
+    for key, i, build in heapq.merge(*[run for run, chunkerrors in results]):
+        versions.append(make(strings[i], strict, key[0], tuple([k[1] for k in key[2]]), build))
+    for run, chunkerrors in results: errors.extend(chunkerrors)
+    return (versions, errors)
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+
+
+"""This module holds dependency resolver picking the newest consistent
+versions of packages from their catalogues.
+
+Constraints are expressed as Matcher() ranges. Resolution is depth-first search
+with conflict-directed backjumping: when a package runs out of candidates the
+search jumps back straight to the most recent decision that contributed to the
+conflict instead of trying every alternative of unrelated decisions in between.
+"""
+
+
+import bisect
+import time
+
+from pyversion.version import Matcher, _asversion
+
+
+class ResolutionError(Exception):
+    pass
+
+
+class ResolutionBudgetError(ResolutionError):
+    pass
+
+
+class Resolver():
+    """Resolver over per-package catalogues of versions.
+
+    `stats` holds counters of the last resolution: explored `states`, `backtracks`
+    (alternatives tried after a failure), `backjumps` (decisions skipped while
+    jumping back) and candidate cache `hits` and `misses`.
+    """
+    def __init__(self, catalogues, dependencies=None, strict=True, cachesize=65536):
+        """:param catalogues: dictionary mapping package names to iterables of versions
+        :param dependencies: dictionary mapping `(package, version)` to requirements or callable
+            `dependencies(package, version)` returning requirements; requirements are dictionaries
+            mapping package names to Matcher() objects or lists of them
+        :param strict: strictness used for version strings
+        :param cachesize: number of memoised candidate lists above which the memo is cleared
+            before next resolution (None makes it unbounded)
+        """
+        self.strict = strict
+        self.cachesize = cachesize
+        self._catalogues = {}
+        for package, versions in catalogues.items():
+            versions = sorted([_asversion(v, strict) for v in versions], key=lambda v: v.key)
+            self._catalogues[package] = ([v.key for v in versions], versions)
+        if dependencies is None: dependencies = {}
+        if callable(dependencies):
+            self._dependencies = dependencies
+        else:
+            table = dict([((package, _asversion(v, strict)), requirements)
+                          for (package, v), requirements in dependencies.items()])
+            self._dependencies = lambda package, version: table.get((package, version), {})
+        self._cache = {}
+        self.stats = {}
+
+    def candidates(self, package, matchers):
+        """Returns tuple of versions of package matching all matchers (newest first).
+        Bounds of matchers are bisected in the sorted catalogue and only exclusions are
+        checked one by one. Results are memoised by compiled bounds of matchers, so equal
+        matchers created anew share results.
+        """
+        token = (package, frozenset([(m._min, m._max, m._but) for m in matchers]))
+        if token in self._cache:
+            self.stats['hits'] = self.stats.get('hits', 0) + 1
+            return self._cache[token]
+        self.stats['misses'] = self.stats.get('misses', 0) + 1
+        keys, versions = self._catalogues.get(package, ([], []))
+        lows = [m._min for m in matchers if m._min is not None]
+        highs = [m._max for m in matchers if m._max is not None]
+        start = bisect.bisect_left(keys, max(lows)) if lows else 0
+        stop = bisect.bisect_right(keys, min(highs)) if highs else len(keys)
+        but = frozenset().union(*[m._but for m in matchers])
+        result = tuple([versions[n] for n in range(stop - 1, start - 1, -1) if keys[n] not in but])
+        self._cache[token] = result
+        return result
+
+    def resolve(self, requirements, budget=None, timeout=None):
+        """Returns dictionary mapping package names to chosen versions.
+
+        Raises ResolutionError if requirements cannot be satisfied and ResolutionBudgetError
+        if more than `budget` states were explored or resolution took longer than `timeout` seconds.
+
+        :param requirements: dictionary mapping package names to Matcher() objects or lists of them
+        """
+        self.stats = {'states': 0, 'backtracks': 0, 'backjumps': 0, 'hits': 0, 'misses': 0}
+        if self.cachesize is not None and len(self._cache) > self.cachesize: self._cache.clear()
+        self._budget, self._deadline = budget, (None if timeout is None else time.monotonic() + timeout)
+        self._assignment, self._constraints = {}, {}
+        self._constrain(None, requirements)
+        conflict = self._search()
+        if conflict is not None: raise ResolutionError('cannot satisfy requirements')
+        return dict(self._assignment)
+
+    def _constrain(self, source, requirements):
+        """Adds requirements introduced by decision on source package (None for root).
+        Returns list of packages that got new constraints.
+        """
+        added = []
+        for package, matchers in requirements.items():
+            if isinstance(matchers, Matcher): matchers = [matchers]
+            for matcher in matchers:
+                self._constraints.setdefault(package, []).append((matcher, source))
+            added.append((package, len(matchers)))
+        return added
+
+    def _unconstrain(self, added):
+        for package, count in added:
+            del self._constraints[package][-count:]
+            if not self._constraints[package]: del self._constraints[package]
+
+    def _matchers(self, package):
+        return [matcher for matcher, source in self._constraints.get(package, [])]
+
+    def _sources(self, package):
+        return set([source for matcher, source in self._constraints.get(package, []) if source is not None])
+
+    def _tick(self):
+        self.stats['states'] += 1
+        if self._budget is not None and self.stats['states'] > self._budget:
+            raise ResolutionBudgetError('budget of {0} states exhausted'.format(self._budget))
+        if self._deadline is not None and time.monotonic() > self._deadline:
+            raise ResolutionBudgetError('resolution timed out')
+
+    def _select(self):
+        """Returns unassigned constrained package with the fewest candidates (or None).
+        """
+        best, fewest = None, None
+        for package in self._constraints:
+            if package in self._assignment: continue
+            count = len(self.candidates(package, self._matchers(package)))
+            if fewest is None or count < fewest: best, fewest = package, count
+        return best
+
+    def _check(self, requirements):
+        """Returns set of packages conflicting with requirements of a candidate or None.
+        """
+        for package, matchers in requirements.items():
+            if isinstance(matchers, Matcher): matchers = [matchers]
+            if package in self._assignment:
+                if not all([m.match(self._assignment[package]) for m in matchers]): return set([package])
+            elif not self.candidates(package, self._matchers(package) + list(matchers)):
+                return self._sources(package)
+        return None
+
+    def _search(self):
+        """Returns None when every constrained package is assigned or set of packages
+        responsible for failure.
+        Decisions are kept on explicit stack of `[package, candidates, conflict, added]` frames
+        so long dependency chains do not hit recursion limit.
+        """
+        stack, failure = [], None
+        while True:
+            if failure is None and not self._push(stack): return None
+            # after a failure the decision is retried only if it contributed to it, otherwise
+            # the search jumps further back
+            if failure is None or self._undo(stack[-1], failure):
+                failure = None if self._advance(stack[-1]) else stack[-1][2]
+            if failure is not None:
+                stack.pop()
+                if not stack: return failure
+
+    def _push(self, stack):
+        """Pushes frame of next package to decide on stack.
+        Returns False if every constrained package is assigned.
+        """
+        package = self._select()
+        if package is None: return False
+        stack.append([package, iter(self.candidates(package, self._matchers(package))), self._sources(package), None])
+        return True
+
+    def _advance(self, frame):
+        """Assigns next consistent candidate of frame's package.
+        Returns False if there are no candidates left.
+        """
+        package, candidates, conflict = frame[0], frame[1], frame[2]
+        for version in candidates:
+            self._tick()
+            requirements = self._dependencies(package, version)
+            clash = self._check(requirements)
+            if clash is not None:
+                conflict |= clash
+                continue
+            self._assignment[package] = version
+            frame[3] = self._constrain(package, requirements)
+            return True
+        return False
+
+    def _undo(self, frame, failure):
+        """Takes back decision of frame after failure below it.
+        Returns False if the decision did not contribute to the failure.
+        """
+        package = frame[0]
+        self._unconstrain(frame[3])
+        del self._assignment[package]
+        if package not in failure:
+            self.stats['backjumps'] += 1
+            return False
+        frame[2] |= failure - set([package])
+        self.stats['backtracks'] += 1
+        return True
+
+
+def resolve(catalogues, requirements, dependencies=None, strict=True, budget=None, timeout=None):
+    """Returns dictionary mapping package names to the newest consistent versions.
+    See Resolver() for description of parameters.
+    """
+    return Resolver(catalogues, dependencies, strict=strict).resolve(requirements, budget=budget, timeout=timeout)
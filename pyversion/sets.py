@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+
+
+"""This module holds logic code for sets of versions described
+as unions of version ranges.
+"""
+
+
+import bisect
+
+from pyversion.version import Matcher, _asversion
+
+
+# sort key lower than key of any version (used for unbounded minimum)
+_lowest = ()
+
+
+class VersionSet():
+    """Set of versions described by sorted, non-overlapping intervals.
+
+    Every interval is a `(min, mininclusive, max, maxinclusive)` tuple of
+    Version() objects (`None` means unbounded) and booleans.
+    Sets are immutable: union (`|`), intersection (`&`), difference (`-`) and
+    complement (`~`) return new sets.
+    Membership test (`in`) is a bisection over interval bounds.
+    """
+    def __init__(self, intervals=(), strict=True):
+        """:param intervals: iterable of `(min, mininclusive, max, maxinclusive)` tuples;
+            bounds may be version strings, Version() objects or None
+        :param strict: strictness used for version strings
+        """
+        self.strict = strict
+        self.intervals = _normalise([(_bound(lo, strict), loinc, _bound(hi, strict), hiinc)
+                                     for lo, loinc, hi, hiinc in intervals])
+        self._lows = [_lowkey(interval) for interval in self.intervals]
+
+    @classmethod
+    def all(cls, strict=True):
+        return cls([(None, False, None, False)], strict=strict)
+
+    @classmethod
+    def empty(cls, strict=True):
+        return cls([], strict=strict)
+
+    @classmethod
+    def range(cls, min=None, max=None, mininclusive=True, maxinclusive=True, strict=True):
+        """Returns set of versions between min and max.
+        """
+        return cls([(min, mininclusive, max, maxinclusive)], strict=strict)
+
+    @classmethod
+    def frommatcher(cls, matcher):
+        """Returns set of versions matched by Matcher() instance.
+        """
+        result = cls.range(matcher.min, matcher.max, strict=matcher.strict)
+        for version in matcher.but:
+            result = result - cls.range(version, version, strict=matcher.strict)
+        return result
+
+    def __contains__(self, version):
+        version = _asversion(version, self.strict)
+        key = version.key
+        n = bisect.bisect_right(self._lows, (key, 0)) - 1
+        if n < 0: return False
+        lo, loinc, hi, hiinc = self.intervals[n]
+        if hi is None: return True
+        return key < hi.key or (hiinc and key == hi.key)
+
+    def match(self, version):
+        """Returns True if version is in the set (same as `in` operator).
+        """
+        return version in self
+
+    def filter(self, versions):
+        """Lazily yields versions that are in the set.
+        """
+        for version in versions:
+            version = _asversion(version, self.strict)
+            if version in self: yield version
+
+    def __bool__(self):
+        return bool(self.intervals)
+
+    def __eq__(self, other):
+        if not isinstance(other, VersionSet): return NotImplemented
+        return _keys(self.intervals) == _keys(other.intervals)
+
+    def __hash__(self):
+        return hash(tuple(_keys(self.intervals)))
+
+    def __repr__(self):
+        parts = []
+        for lo, loinc, hi, hiinc in self.intervals:
+            parts.append('{0}{1}, {2}{3}'.format(('[' if loinc else '('), ('' if lo is None else repr(lo)),
+                                                 ('' if hi is None else repr(hi)), (']' if hiinc else ')')))
+        return 'VersionSet({0})'.format(' | '.join(parts) or 'empty')
+
+    def __or__(self, other):
+        return VersionSet(self.intervals + _asset(other, self.strict).intervals, strict=self.strict)
+
+    def __invert__(self):
+        result, lo, loinc = [], None, False
+        for start, startinc, end, endinc in self.intervals:
+            if start is not None: result.append((lo, loinc, start, not startinc))
+            lo, loinc = end, not endinc
+        if lo is not None or not self.intervals: result.append((lo, loinc, None, False))
+        return VersionSet(result, strict=self.strict)
+
+    def __and__(self, other):
+        return ~(~self | ~_asset(other, self.strict))
+
+    def __sub__(self, other):
+        return self & ~_asset(other, self.strict)
+
+    union, intersection, difference, complement = __or__, __and__, __sub__, __invert__
+
+
+def _asset(other, strict):
+    if isinstance(other, VersionSet): return other
+    if isinstance(other, Matcher): return VersionSet.frommatcher(other)
+    raise TypeError('expected VersionSet or Matcher, got {0}'.format(type(other).__name__))
+
+
+def _bound(version, strict):
+    return None if version is None else _asversion(version, strict)
+
+
+def _lowkey(interval):
+    """Returns sort key of lower bound; inclusive bound goes before exclusive one.
+    """
+    lo, loinc = interval[0], interval[1]
+    if lo is None: return (_lowest, 0)
+    return (lo.key, 0 if loinc else 1)
+
+
+def _highkey(interval):
+    """Returns sort key of upper bound; exclusive bound goes before inclusive one.
+    """
+    hi, hiinc = interval[2], interval[3]
+    if hi is None: return None
+    return (hi.key, 1 if hiinc else 0)
+
+
+def _empty(interval):
+    lo, loinc, hi, hiinc = interval
+    if lo is None or hi is None: return False
+    return lo.key > hi.key or (lo.key == hi.key and not (loinc and hiinc))
+
+
+def _touches(high, interval):
+    """Returns True if interval starts before (or right at) the end of interval with given high key.
+    """
+    if high is None: return True
+    lo, loinc = interval[0], interval[1]
+    if lo is None or lo.key < high[0]: return True
+    # [.., x) + [x, ..) and [.., x] + (x, ..) are joined, (.., x) + (x, ..) is not
+    return lo.key == high[0] and (high[1] or loinc)
+
+
+def _normalise(intervals):
+    """Returns sorted list of non-empty, non-overlapping intervals.
+    """
+    intervals = sorted([i for i in intervals if not _empty(i)], key=_lowkey)
+    result = []
+    for interval in intervals:
+        if result and _touches(_highkey(result[-1]), interval):
+            last = result[-1]
+            high, other = _highkey(last), _highkey(interval)
+            if high is not None and (other is None or other > high): last = last[:2] + interval[2:]
+            result[-1] = last
+        else:
+            result.append(interval)
+    return result
+
+
+def _keys(intervals):
+    return [(_lowkey(i), _highkey(i)) for i in intervals]
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+
+
+"""This module holds sorted container of versions answering
+"latest", "floor/ceiling" and range queries with bisection.
+"""
+
+
+import bisect
+
+from pyversion.version import Matcher, _asversion
+
+
+class VersionStore():
+    """Sorted collection of versions.
+
+    Versions are kept sorted by their `key` so build metadata is preserved
+    but does not affect ordering; versions differing only in build metadata are all
+    kept, in the order they were added.
+    """
+    def __init__(self, versions=(), strict=True):
+        """:param versions: iterable of version strings or Version() objects
+        :param strict: strictness used for version strings
+        """
+        self.strict = strict
+        self._versions = sorted([_asversion(v, strict) for v in versions], key=lambda v: v.key)
+        self._keys = [v.key for v in self._versions]
+
+    def __len__(self):
+        return len(self._versions)
+
+    def __iter__(self):
+        return iter(self._versions)
+
+    def __reversed__(self):
+        return reversed(self._versions)
+
+    def __getitem__(self, n):
+        return self._versions[n]
+
+    def __contains__(self, version):
+        key = _asversion(version, self.strict).key
+        n = bisect.bisect_left(self._keys, key)
+        return n < len(self._keys) and self._keys[n] == key
+
+    def __repr__(self):
+        return 'VersionStore([{0}])'.format(', '.join([repr(v) for v in self._versions]))
+
+    def add(self, version):
+        """Inserts version keeping the store sorted.
+        Bisection finds the place in O(log n) but inserting into lists moves later items,
+        so every insert is O(n); it is a single memory move, fast enough for stores of
+        hundreds of thousands of versions, and keeps queries plain list bisection.
+        Build stores from many versions at once with `VersionStore(versions)`, which sorts once.
+        """
+        version = _asversion(version, self.strict)
+        n = bisect.bisect_right(self._keys, version.key)
+        self._keys.insert(n, version.key)
+        self._versions.insert(n, version)
+
+    def remove(self, version):
+        """Removes version with the same key and build metadata.
+        Raises ValueError if there is no such version.
+        """
+        version = _asversion(version, self.strict)
+        n = bisect.bisect_left(self._keys, version.key)
+        while n < len(self._keys) and self._keys[n] == version.key:
+            if self._versions[n].build == version.build:
+                del self._keys[n], self._versions[n]
+                return
+            n += 1
+        raise ValueError('version not in store: {0}'.format(repr(version)))
+
+    def _bounds(self, matcher):
+        """Returns slice indexes of versions between bounds of matcher.
+        """
+        low, high = 0, len(self._keys)
+        if matcher is not None and matcher.min is not None: low = bisect.bisect_left(self._keys, matcher.min.key)
+        if matcher is not None and matcher.max is not None: high = bisect.bisect_right(self._keys, matcher.max.key)
+        return (low, high)
+
+    def latest(self, include_prerelease=False, matcher=None):
+        """Returns greatest version or None if there is no version to return.
+
+        :param include_prerelease: whether prereleases may be returned
+        :param matcher: optional Matcher() limiting candidates; bounds are inclusive so for latest 3.x
+            release exclude the upper bound: `Matcher(min='3.0.0', max='4.0.0', but=['4.0.0'])`
+            (with `include_prerelease` this also admits prereleases of `4.0.0`, which are lesser than it)
+        """
+        low, high = self._bounds(matcher)
+        for n in range(high - 1, low - 1, -1):
+            version = self._versions[n]
+            if not include_prerelease and version.prerelease: continue
+            if matcher is not None and version.key in matcher._but: continue
+            return version
+        return None
+
+    def floor(self, version):
+        """Returns greatest version lesser or equal to given one or None.
+        """
+        n = bisect.bisect_right(self._keys, _asversion(version, self.strict).key)
+        return self._versions[n-1] if n else None
+
+    def ceiling(self, version):
+        """Returns smallest version greater or equal to given one or None.
+        """
+        n = bisect.bisect_left(self._keys, _asversion(version, self.strict).key)
+        return self._versions[n] if n < len(self._versions) else None
+
+    def before(self, version):
+        """Returns greatest version lesser than given one or None.
+        """
+        n = bisect.bisect_left(self._keys, _asversion(version, self.strict).key)
+        return self._versions[n-1] if n else None
+
+    def after(self, version):
+        """Returns smallest version greater than given one or None.
+        """
+        n = bisect.bisect_right(self._keys, _asversion(version, self.strict).key)
+        return self._versions[n] if n < len(self._versions) else None
+
+    def range(self, min=None, max=None, but=[]):
+        """Yields versions matching `Matcher(min, max, but)` in ascending order
+        (minimal and maximal versions are **included**).
+        """
+        matcher = min if isinstance(min, Matcher) else Matcher(min=min, max=max, but=but, strict=self.strict)
+        low, high = self._bounds(matcher)
+        for n in range(low, high):
+            if self._keys[n] not in matcher._but: yield self._versions[n]
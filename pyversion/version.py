@@ -10,10 +10,13 @@
 """
 
 
-import re
+import collections
+import contextlib
+import functools
+import sys
+import time
 
 
-valid_identifier_regexp = re.compile('^[0-9A-Za-z-]*$')
 # this is a strict version
 base_regexp = ('[0-9]+\.[0-9]+\.[0-9]+'                     # major.minor.patch
                '(-([0-9A-Za-z-]+)(\.[0-9A-Za-z-]+)*)?'      # prerelease
@@ -25,7 +28,39 @@ permissive_regexp = ('[0-9]+(\.[0-9]+)*'                          # major.minor.
                      '(-([0-9A-Za-z-]+)(\.[0-9A-Za-z-]+)*)?'      # prerelease
                      '(\+([0-9A-Za-z-]+)(\.[0-9A-Za-z-]+)*)?')    # build
 
-match_regexp = re.compile('^{0}$'.format(base_regexp))
+# compiled (and `re` imported) on first use through `pattern()` or module attributes
+# `strict_pattern`, `permissive_pattern`, `match_regexp` and `valid_identifier_regexp`;
+# named groups let Version() pick the string apart without splitting it again
+_sources = {
+    'valid_identifier_regexp': '^[0-9A-Za-z-]*$',
+    'strict_pattern': ('^(?P<base>(?P<major>[0-9]+)\\.(?P<minor>[0-9]+)\\.(?P<patch>[0-9]+))'   # major.minor.patch
+                       '(-(?P<prerelease>[0-9A-Za-z-]+(\\.[0-9A-Za-z-]+)*))?'                  # prerelease
+                       '(\\+(?P<build>[0-9A-Za-z-]+(\\.[0-9A-Za-z-]+)*))?$'),                  # build
+    'permissive_pattern': ('^(?P<base>(?P<major>[0-9]+)(\\.(?P<minor>[0-9]+))?'
+                           '(\\.(?P<patch>[0-9]+))?(\\.[0-9]+)*)'                             # major.minor.patch
+                           '(-(?P<prerelease>[0-9A-Za-z-]+(\\.[0-9A-Za-z-]+)*))?'             # prerelease
+                           '(\\+(?P<build>[0-9A-Za-z-]+(\\.[0-9A-Za-z-]+)*))?$'),              # build
+}
+_aliases = {'match_regexp': 'strict_pattern'}
+_compiled = {}
+
+
+def _compile(name):
+    try:
+        return _compiled[name]
+    except KeyError:
+        import re
+        _compiled[name] = re.compile(_sources[name])
+        return _compiled[name]
+
+
+def __getattr__(name):
+    name = _aliases.get(name, name)
+    if name not in _sources: raise AttributeError('module {0!r} has no attribute {1!r}'.format(__name__, name))
+    return _compile(name)
+
+
+CacheInfo = collections.namedtuple('CacheInfo', ('hits', 'misses', 'maxsize', 'currsize'))
 
 
 class InvalidVersionStringError(Exception):
@@ -61,27 +96,101 @@ def extendedzip(a, b, start=0):
     return zipped
 
 
-def _split(string):
-    """Splits version string into main version,
-    prerelease and build metadata.
+def pattern(strict=True):
+    """Returns compiled pattern for strict or permissive version strings.
+    Match objects have `base`, `major`, `minor`, `patch`, `prerelease` and `build` groups.
+
+    :param strict: tells whether to use strict or permissive version of the version-string regexp
     """
-    version, prerelease, build = '', '', ''
-    if '-' in string:
-        n = string.index('-')
-        version = string[:n]
-        prerelease = string[n+1:]
-    else:
-        version = string
-
-    if '+' in prerelease:
-        n = prerelease.rindex('+')
-        build = prerelease[n+1:]
-        prerelease = prerelease[:n]
-    if '+' in version:
-        n = version.rindex('+')
-        build = version[n+1:]
-        version = version[:n]
-    return (version, prerelease, build)
+    name = 'strict_pattern' if strict else 'permissive_pattern'
+    try: return _compiled[name]
+    except KeyError: return _compile(name)
+
+
+def _key(base, prerelease):
+    """Builds total-order sort key from base and prerelease.
+
+    Key is a tuple `(base, release, identifiers)` where release versions
+    get `1` and prereleases `0` (so `1.0.0-rc` < `1.0.0`), and every
+    identifier is wrapped as `(1, int)` or `(0, str)` so integers
+    sort above strings.
+    Shorter bases sort first (`1.0` < `1.0.0`) as plain tuples do.
+    """
+    if not prerelease: return (tuple(base), 1, ())
+    return (tuple(base), 0, tuple([((1, i) if type(i) is int else (0, i)) for i in prerelease]))
+
+
+def _regexpparse(string, strict):
+    """Parses version string using `pattern()`.
+    Returns `(base, prerelease, build)` tuple.
+    """
+    match = pattern(strict).match(string)
+    if match is None:
+        raise InvalidVersionStringError('invalid version string: {0}'.format(string))
+    base = tuple([int(i) for i in match.group('base').split('.')])
+    prerelease = match.group('prerelease')
+    if prerelease: prerelease = prerelease.split('.')
+    else: prerelease = []
+    for i in range(len(prerelease)):
+        identifier = prerelease[i]
+        if not _compile('valid_identifier_regexp').match(identifier):
+            raise InvalidIdentifierError('invalid identifier (part {0}): {1}'.format(i+1, identifier))
+        if identifier.isdecimal(): identifier = int(identifier)
+        prerelease[i] = identifier
+    return (base, tuple(prerelease), match.group('build') or '')
+
+
+_digits = frozenset('0123456789')
+_basechars = frozenset('0123456789.')
+_identifierchars = frozenset('0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz-.')
+
+
+def _scanparse(string, strict):
+    """Parses version string without regular expressions.
+    Gives the same results and errors as `_regexpparse()` but is faster.
+    Returns `(base, prerelease, build)` tuple.
+    """
+    text = string
+    if text[-1:] == '\n': text = text[:-1]   # `$` in patterns accepts one trailing newline
+    text, plus, build = text.partition('+')
+    text, minus, prerelease = text.partition('-')
+    base = text.split('.')
+    identifiers = prerelease.split('.') if minus else []
+    validbase = (not strict or len(base) == 3) and '' not in base and _basechars.issuperset(text)
+    validprerelease = not minus or ('' not in identifiers and _identifierchars.issuperset(prerelease))
+    validbuild = not plus or ('' not in build.split('.') and _identifierchars.issuperset(build))
+    if not (validbase and validprerelease and validbuild):
+        raise InvalidVersionStringError('invalid version string: {0}'.format(string))
+    prerelease = tuple([(int(i) if _digits.issuperset(i) else i) for i in identifiers])
+    return (tuple([int(i) for i in base]), prerelease, build)
+
+
+_parser = _scanparse
+
+
+def useparser(name):
+    """Selects parser used by Version().
+    Both parsers accept and reject the same strings.
+
+    :param name: `'scanner'` (default, faster) or `'regexp'`
+    :type name: str
+    """
+    global _parser
+    parsers = {'scanner': _scanparse, 'regexp': _regexpparse}
+    if name not in parsers: raise ValueError('unknown parser: {0}'.format(name))
+    _parser = parsers[name]
+    if _profiled:
+        _profiled[(sys.modules[__name__], '_parser')] = _parser
+        _parser = _timed('parse', _parser)
+
+
+def _format(base, prerelease, build):
+    """Returns version string made of base, prerelease and build metadata.
+    """
+    final = '.'.join([str(i) for i in base])
+    if prerelease: final = '{0}-{1}'.format(final, '.'.join([str(i) for i in prerelease]))
+    if build: final = '{0}+{1}'.format(final, build)
+    return final
 
 
 def valid(string, strict=True):
@@ -91,9 +200,7 @@ def valid(string, strict=True):
     :param string: string to check
     :param strict: tells whether to use strict or permissive version of the version-string regexp
     """
-    if strict: regexp = base_regexp
-    else: regexp = permissive_regexp
-    return re.compile('^{}$'.format(regexp)).match(string) is not None
+    return pattern(strict).match(string) is not None
 
 
 def extract(string, strict=True):
@@ -103,13 +210,37 @@ def extract(string, strict=True):
     :param strict: tells whether to use strict or permissive version of the version-string regexp
     """
     version = ''
-    if strict: regexp = base_regexp
-    else: regexp = permissive_regexp
-    try: version = re.compile('^{}$'.format(regexp)).search(string).group(0)
+    try: version = pattern(strict).search(string).group(0)
     except AttributeError: pass
     finally: return version
 
 
+def compare(first, second):
+    """Returns `-1`, `0` or `1` if first version is lesser than, equal to
+    or greater than second version.
+
+    Bases are compared as tuples (`0.0.0` < `0.0.0.0`); release is greater than any of
+    its prereleases; prerelease identifiers are compared one by one and
+    integers are *greater* than strings.
+    Build metadata is ignored.
+
+    :param first: first version
+    :type first: pyversion.version.Version
+    :param second: second version
+    :type second: pyversion.version.Version
+    """
+    a, b = first._base, second._base
+    if a != b: return -1 if a < b else 1
+    a, b = first._prerelease, second._prerelease
+    if not a or not b: return (not a) - (not b)
+    for x, y in zip(a, b):
+        if x == y: continue
+        xint, yint = type(x) is int, type(y) is int
+        if xint != yint: return 1 if xint else -1
+        return -1 if x < y else 1
+    return (len(a) > len(b)) - (len(a) < len(b))
+
+
 class Comparison():
     """Class utilizing version comparison functionality.
 
@@ -119,138 +250,96 @@ class Comparison():
     Also remember that integers are *greater* than strings so
         0 > 'a' -> True
         0 < 'a' -> False
+
+    Every method is derived from a single three-way `compare()` call
+    (or call of given Comparator()).
     """
-    def __init__(self, first, second):
+    def __init__(self, first, second, comparator=None):
         """:param first: first version
-        :type first: str
+        :type first: pyversion.version.Version
         :param second: second version
-        :type second: str
+        :type second: pyversion.version.Version
+        :param comparator: optional Comparator() memoising results
         """
         self.first = first
         self.second = second
+        self.comparator = comparator
 
-    def _baseeq(self, start=0, end=0):
-        """Returns True if base versions are equal.
-        """
-        first = self.first.base[start:]
-        second = self.second.base[start:]
-        if end:
-            first = first[:end]
-            second = second[:end]
-        return first == second
-
-    def _basegt(self):
-        """Returns True if first version's base is greater than second version's base.
-        Keep in mind that `0.0.0.0` is greater than `0.0.0`.
-        """
-        result = False
-        zipped = extendedzip(self.first.base, self.second.base)
-        for i in range(len(zipped)):
-            first, second = zipped[i]
-            if i == 0:
-                if first > second: result = True
-            else:
-                if self._baseeq(end=i) and first > second: result = True
-            if result: break
-        return result
-
-    def _baselt(self):
-        """Returns True if first version's base if lesser than second version's base.
-        Keep in mind that `0.0.0` is lesser than `0.0.0.0`.
-        """
-        result = False
-        zipped = extendedzip(self.first.base, self.second.base)
-        for i in range(len(zipped)):
-            first, second = zipped[i]
-            if i == 0:
-                if first < second: result = True
-            else:
-                if self._baseeq(end=i) and first < second: result = True
-            if result: break
-        return result
-
-    def _prereleaseeq(self):
-        """Returns True if prerelease tags are equal in fisrt and second version.
-        """
-        return self.first.prerelease == self.second.prerelease
-
-    def _prereleasegt(self, n):
-        """Checks if prerelease identifiers of first version are greater than second version.
-
-        :param n: index at which we are starting comparison
-        :type n: int
-        """
-        result = False
-        try:
-            if not self.first.prerelease and self.second.prerelease: result = True
-            elif self.first.prerelease and not self.second.prerelease: result = False
-            else:
-                first, second = extendedzip(self.first.prerelease, self.second.prerelease, n)[0]
-                try:
-                    comp = first > second
-                except TypeError:
-                    if type(first) == int: comp = True
-                    else: comp = False
-                finally:
-                    if comp or self._prereleasegt(n=n+1): result = True
-        except IndexError:
-            pass
-        finally:
-            return result
-
-    def _prereleaselt(self, n):
-        """Checks if prerelease identifiers of first are lesser than second.
-
-        :param n: index at which we are starting comparison
-        :type n: int
+    def compare(self):
+        """Returns `-1`, `0` or `1` (see `pyversion.version.compare()`).
         """
-        result = False
-        try:
-            if not self.first.prerelease and self.second.prerelease: result = False
-            elif self.first.prerelease and not self.second.prerelease: result = True
-            else:
-                first, second = extendedzip(self.first.prerelease, self.second.prerelease, n)[0]
-                try:
-                    comp = first < second
-                except TypeError:
-                    if type(first) == int: comp = False
-                    else: comp = True
-                finally:
-                    if comp or self._prereleaselt(n=n+1): result = True
-        except IndexError:
-            pass
-        finally:
-            return result
+        return (self.comparator or compare)(self.first, self.second)
 
     def eq(self):
         """Returns True if versions are equal.
         False otherwise.
         """
-        return self._baseeq() and self._prereleaseeq()
+        return (self.comparator or compare)(self.first, self.second) == 0
 
     def gt(self):
         """Returns True if first version is greater than second.
         False otherwise.
         """
-        result = False
-        if self._basegt(): result = True
-        elif self._baseeq() and self._prereleasegt(0): result = True
-        return result
+        return (self.comparator or compare)(self.first, self.second) > 0
 
     def lt(self):
         """Returns True if first version is lesser than second.
         False otherwise.
         """
-        result = False
-        if self._baselt(): result = True
-        elif self._baseeq() and self._prereleaselt(0): result = True
-        return result
+        return (self.comparator or compare)(self.first, self.second) < 0
 
     def ge(self):
-        return self.eq() or self.gt()
+        return (self.comparator or compare)(self.first, self.second) >= 0
 
     def le(self):
-        return self.eq() or self.lt()
+        return (self.comparator or compare)(self.first, self.second) <= 0
+
+
+class Comparator():
+    """Reusable three-way comparator memoising results of `compare()`.
+
+    Pairs are remembered by identity of Version() objects (interned versions
+    are shared, so equal strings give the same pair); memoised versions are
+    kept alive so identities are not reused. Least recently used pairs are
+    evicted when there are more than `maxsize` of them (None means no limit).
+    Memoising pays off for versions with long lists of prerelease identifiers;
+    for short ones plain `compare()` is faster than a memo lookup.
+
+    Instances are callable, e.g. `sorted(versions, key=functools.cmp_to_key(Comparator()))`.
+    """
+    def __init__(self, maxsize=4096):
+        """:param maxsize: maximal number of memoised pairs (0 disables memoising, None makes the memo unbounded)
+        :type maxsize: int
+        """
+        self.maxsize = maxsize
+        self._memo = collections.OrderedDict()
+        self._hits, self._misses = 0, 0
+
+    def __call__(self, first, second):
+        token = (id(first), id(second))
+        memo = self._memo
+        entry = memo.get(token)
+        if entry is not None:
+            self._hits += 1
+            memo.move_to_end(token)
+            return entry[0]
+        self._misses += 1
+        result = compare(first, second)
+        if self.maxsize is None or self.maxsize > 0:
+            memo[token] = (result, first, second)
+            if self.maxsize is not None and len(memo) > self.maxsize: memo.popitem(last=False)
+        return result
+
+    def cacheinfo(self):
+        """Returns `(hits, misses, maxsize, currsize)` named tuple.
+        """
+        return CacheInfo(self._hits, self._misses, self.maxsize, len(self._memo))
+
+    def cacheclear(self):
+        """Forgets memoised results and resets statistics.
+        """
+        self._memo.clear()
+        self._hits, self._misses = 0, 0
 
 
 class Matcher():
@@ -258,6 +347,10 @@ class Matcher():
 
     When matching versions remember that Matcher() will match
     minimal and maximal versions **including** the given ones.
+
+    Bounds are compiled to sort keys and exclusions to a set of keys
+    when Matcher() is created so matching a version is two tuple comparisons
+    and one set lookup.
     """
     def __init__(self, min=None, max=None, but=[], strict=True):
         """To match only one version set the same version to min and
@@ -265,33 +358,51 @@ class Matcher():
         In order to match every version except one leave `min` and `max` as
         None and set only `but` parameter.
 
-        :param min: minimal version
-        :param max: maximal version
+        :param min: minimal version (string or Version() object)
+        :param max: maximal version (string or Version() object)
         :param but: match all **but** these versions
         """
         self.min, self.max = None, None
-        self.but = []
+        self.but = set()
         self.strict = strict
-        if min is not None: self.min = Version(min, strict=self.strict)
-        if max is not None: self.max = Version(max, strict=self.strict)
-        if but: self.but = [Version(b, strict=self.strict) for b in but]
+        if min is not None: self.min = _asversion(min, self.strict)
+        if max is not None: self.max = _asversion(max, self.strict)
+        if but: self.but = set([_asversion(b, self.strict) for b in but])
+        self._min = None if self.min is None else self.min.key
+        self._max = None if self.max is None else self.max.key
+        self._but = frozenset([b.key for b in self.but])
 
     def match(self, version):
         """Returns True if given version matches Matcher() instance.
+
+        :param version: version string or Version() object (used as is)
         """
-        version, result = Version(version, strict=self.strict), False
-        min, max = self.min is not None, self.max is not None
-        if min and not max:
-            result = Comparison(version, self.min).ge()
-        elif not min and max:
-            result = Comparison(version, self.max).le()
-        elif min and max:
-            result = Comparison(version, self.min).ge() and Comparison(version, self.max).le()
-        elif not min and not max:
-            result = True
-
-        if self.but and version in self.but: result = False
-        return result
+        if not isinstance(version, Version): version = Version(version, strict=self.strict)
+        key = version.key
+        if self._min is not None and key < self._min: return False
+        if self._max is not None and key > self._max: return False
+        return key not in self._but
+
+    def filter(self, versions):
+        """Lazily yields versions that match Matcher() instance.
+        Strings are parsed, Version() objects are used as is.
+
+        :param versions: iterable of version strings or Version() objects
+        """
+        low, high, but, strict = self._min, self._max, self._but, self.strict
+        for version in versions:
+            if not isinstance(version, Version): version = Version(version, strict=strict)
+            key = version.key
+            if (low is None or key >= low) and (high is None or key <= high) and key not in but:
+                yield version
+
+
+def _asversion(version, strict=True):
+    """Returns Version() object for version string;
+    Version() objects are returned as they are.
+    """
+    if isinstance(version, Version): return version
+    return Version(version, strict=strict)
 
 
 class Version():
@@ -305,40 +416,101 @@ class Version():
     build metadata). If you want to have full representation use `repr()`.
 
     If converted to `bool()` it always returns True.
+
+    `key` holds precomputed sort key so `sorted()`, `max()` or `bisect` compare
+    plain tuples instead of creating Comparison() objects.
+
+    Version() objects are immutable and hashable (build metadata is ignored just like
+    in comparisons) so they can be put in sets and used as dictionary keys.
+    `base` and `prerelease` are returned as fresh lists; internally they are kept as tuples.
+    Because of that, parsed versions are interned: creating a version from the same
+    `(string, strict)` pair twice returns the same object.
     """
-    def __init__(self, string, strict=True):
-        """:param string: version string
+    __slots__ = ('_string', '_strict', '_base', '_prerelease', '_build', '_key')
+
+    def __new__(cls, string, strict=True):
+        """Returns shared instance from intern cache (see `cacheinfo()`)
+        or parses the string.
+
+        :param string: version string
         :type string: str
         """
-        self.string = string
-        self.strict = strict
-        self.major, self.minor, self.patch = 0, 0, 0
-        self.base, self.prerelease, self.build = [], [], ''
-        if not valid(string=self.string, strict=self.strict):
-            raise InvalidVersionStringError('invalid version string: {0}'.format(self.string))
-        version, prerelease, build = _split(self.string)
-        self._setversion(version)
-        self._setprerelease(prerelease)
-        self._setbuild(build)
+        return _intern(cls, string, strict)
+
+    @classmethod
+    def _parse(cls, string, strict):
+        """Creates new, uncached version object.
+        """
+        base, prerelease, build = _parser(string, strict)
+        return cls._make(string, strict, base, prerelease, build)
+
+    @classmethod
+    def parse_many(cls, strings, strict=True):
+        """Parses many version strings at once.
+
+        Returns `(versions, errors)` tuple where `versions` is a list of parsed versions
+        (in input order, invalid strings skipped) and `errors` is a list of
+        `(index, string, reason)` tuples describing the invalid strings.
+
+        Repeated strings are parsed once per batch. The intern cache is bypassed
+        so big batches do not evict versions used elsewhere.
+
+        :param strings: iterable of version strings
+        :param strict: tells whether to use strict or permissive version strings
+        """
+        versions, errors, parsed = [], [], {}
+        parser, make = _parser, cls._make
+        for index, string in enumerate(strings):
+            version = parsed.get(string)
+            if version is None:
+                try:
+                    version = make(string, strict, *parser(string, strict))
+                except (InvalidVersionStringError, InvalidIdentifierError) as e:
+                    errors.append((index, string, str(e)))
+                    continue
+                parsed[string] = version
+            versions.append(version)
+        return (versions, errors)
+
+    @classmethod
+    def _make(cls, string, strict, base, prerelease, build):
+        """Creates version object from already validated parts.
+
+        :param base: tuple of integers
+        :param prerelease: tuple of identifiers (integers or strings)
+        :param build: build metadata string
+        """
+        self = object.__new__(cls)
+        self._string = string
+        self._strict = strict
+        self._base = base
+        self._prerelease = prerelease
+        self._build = build
+        self._key = _key(base, prerelease)
+        return self
 
     def __eq__(self, v):
         """Checks if two versions are equal.
         """
-        return Comparison(self, v).eq()
+        if not isinstance(v, Version): return NotImplemented
+        return self._key == v._key
+
+    def __hash__(self):
+        return hash(self._key)
 
     def __lt__(self, v):
         """Checks if different version is lesser than this version.
         :param v: version object
         :type v: pyversion.version.Version
         """
-        return Comparison(self, v).lt()
+        return self._key < v._key
 
     def __gt__(self, v):
         """Checks if different version is greater than this version.
         :param v: version object
         :type v: pyversion.version.Version
         """
-        return Comparison(self, v).gt()
+        return self._key > v._key
 
     def __ge__(self, v):
         """Checks if different version is greater or equal to this version.
@@ -346,7 +518,7 @@ class Version():
         :param v: version object
         :type v: pyversion.version.Version
         """
-        return Comparison(self, v).ge()
+        return self._key >= v._key
 
     def __le__(self, v):
         """Checks if different version is lesser or equal to this version.
@@ -354,23 +526,23 @@ class Version():
         :param v: version object
         :type v: pyversion.version.Version
         """
-        return Comparison(self, v).le()
+        return self._key <= v._key
+
+    def __reduce__(self):
+        return (self.__class__, (self._string, self._strict))
 
     def __str__(self):
         """Returns only version (without prerelease or
         build metadata).
         To get string representation with more info use repr().
         """
-        return '.'.join([str(i) for i in self.base])
+        return '.'.join([str(i) for i in self._base])
 
     def __repr__(self):
         """Returns version, prerelease and build metadata.
         To get only version use str().
         """
-        final = str(self)
-        if self.prerelease: final = '{0}-{1}'.format(final, '.'.join([str(i) for i in self.prerelease]))
-        if self.build: final = '{0}+{1}'.format(final, self.build)
-        return final
+        return _format(self._base, self._prerelease, self._build)
 
     def __bool__(self):
         """Always True.
@@ -380,8 +552,7 @@ class Version():
     def __iter__(self):
         """Iterates over everything - version and prerelease.
         """
-        version = self.base + self.prerelease
-        return iter(version)
+        return iter(self._base + self._prerelease)
 
     def __getitem__(self, n):
         """Returns items only from version and
@@ -390,40 +561,41 @@ class Version():
         """
         return self.base[n]
 
-    def _setversion(self, version):
-        """Sets version.
-        :param version: version string (e.g.: 3.9.2 or 4.2.5.6)
-        :type version: str
-        """
-        version = [int(i) for i in version.split('.')]
-        self.base = [i for i in version]
-        while len(version) < 3: version.append(-1)
-        self.major = version[0]
-        self.minor = version[1]
-        self.patch = version[2]
-
-    def _setprerelease(self, prerelease):
-        """Sets prerelease.
-        :param prerelease: prerelease string (e.g.: alpha.1.release.3)
-        :type prerelease: str
-        """
-        if prerelease: prerelease = prerelease.split('.')
-        else: prerelease = []
-
-        for i in range(len(prerelease)):
-            identifier = prerelease[i]
-            if not re.match(valid_identifier_regexp, identifier):
-                raise InvalidIdentifierError('invalid identifier (part {0}): {1}'.format(i+1, identifier))
-            if identifier.isdecimal(): identifier = int(identifier)
-            prerelease[i] = identifier
-        self.prerelease = prerelease
-
-    def _setbuild(self, build):
-        """Sets build metadata.
-        :param build: build metadata (build.0.commit.5f265c)
-        :type build: str
-        """
-        self.build = build
+    @property
+    def string(self):
+        return self._string
+
+    @property
+    def strict(self):
+        return self._strict
+
+    @property
+    def base(self):
+        return list(self._base)
+
+    @property
+    def prerelease(self):
+        return list(self._prerelease)
+
+    @property
+    def build(self):
+        return self._build
+
+    @property
+    def key(self):
+        return self._key
+
+    @property
+    def major(self):
+        return self._base[0]
+
+    @property
+    def minor(self):
+        return self._base[1] if len(self._base) > 1 else -1
+
+    @property
+    def patch(self):
+        return self._base[2] if len(self._base) > 2 else -1
 
     def satisfies(self, min=None, max=None, but=[]):
         """Returns True if this version satisfies requirements
@@ -435,4 +607,199 @@ class Version():
         :param max: maximal version
         :param but: match all **but** these versions
         """
-        return Matcher(min=min, max=max, but=but, strict=self.strict).match(repr(self))
+        return Matcher(min=min, max=max, but=but, strict=self.strict).match(self)
+
+    def _derive(self, base, prerelease):
+        """Returns new version (without build metadata) made of already valid parts.
+        """
+        return self._make(_format(base, prerelease, ''), self._strict, base, prerelease, '')
+
+    def bump(self, part='patch'):
+        """Returns next version with given base component incremented,
+        following components set to zero and prerelease and build metadata dropped
+        (e.g. `1.2.3-rc.1` bumped at minor is `1.3.0`).
+        Use `finalize()` to turn a prerelease into its release.
+
+        :param part: `'major'`, `'minor'`, `'patch'` or index of base component (non-strict versions
+            are extended with zeros when index is past their end)
+        """
+        n = {'major': 0, 'minor': 1, 'patch': 2}.get(part, part)
+        if type(n) is not int or n < 0 or (self._strict and n > 2):
+            raise ValueError('invalid version part: {0}'.format(part))
+        base = self._base + (0,) * (n + 1 - len(self._base))
+        return self._derive(base[:n] + (base[n] + 1,) + (0,) * (len(base) - n - 1), ())
+
+    def bumpprerelease(self):
+        """Returns next prerelease: last identifier is incremented if it is an integer,
+        otherwise `0` is appended (`rc.8` -> `rc.9`, `rc` -> `rc.0`).
+        Raises ValueError for versions without prerelease.
+        """
+        prerelease = self._prerelease
+        if not prerelease: raise ValueError('version has no prerelease: {0}'.format(repr(self)))
+        if type(prerelease[-1]) is int: prerelease = prerelease[:-1] + (prerelease[-1] + 1,)
+        else: prerelease = prerelease + (0,)
+        return self._derive(self._base, prerelease)
+
+    def finalize(self):
+        """Returns release version without prerelease identifiers and build metadata.
+        """
+        return self._derive(self._base, ())
+
+    @classmethod
+    def bump_many(cls, versions, part='patch', strict=True):
+        """Returns list of next versions for many versions at once
+        (see `bump()`; `part` may also be `'prerelease'` or `'final'`).
+
+        :param versions: iterable of Version() objects or version strings
+        :param strict: strictness used for version strings
+        """
+        if part == 'prerelease': method = cls.bumpprerelease
+        elif part == 'final': method = cls.finalize
+        else: method = lambda version: cls.bump(version, part)
+        results, done = [], {}
+        for version in versions:
+            version = _asversion(version, strict)
+            token = (version.key, version.strict)
+            if token not in done: done[token] = method(version)
+            results.append(done[token])
+        return results
+
+
+def _internparse(cls, string, strict):
+    return cls._parse(string, strict)
+
+
+_intern = functools.lru_cache(maxsize=4096)(_internparse)
+
+
+def cacheinfo():
+    """Returns statistics of Version() intern cache as
+    `(hits, misses, maxsize, currsize)` named tuple.
+    """
+    return _intern.cache_info()
+
+
+def cacheclear():
+    """Empties Version() intern cache and resets its statistics.
+    """
+    _intern.cache_clear()
+    _cachebase[:] = [0, 0]
+
+
+def cacheresize(maxsize):
+    """Changes size of Version() intern cache.
+    Cached versions and statistics are dropped.
+
+    :param maxsize: maximal number of cached versions (0 disables caching, None makes the cache unbounded)
+    :type maxsize: int
+    """
+    global _intern
+    _intern = functools.lru_cache(maxsize=maxsize)(_internparse)
+    _cachebase[:] = [0, 0]
+
+
+# profiling replaces hot functions and methods with counting wrappers and puts the originals
+# back when disabled, so it costs nothing when off; names imported with `from pyversion.version import`
+# before enabling keep pointing to the originals and are not counted
+operations = ('parse', 'validate', 'compare', 'match', 'extract')
+_profile = dict([(operation, [0, 0.0]) for operation in operations])
+_profiled = {}
+_hooks = []
+_cachebase = [0, 0]
+
+
+def _profiletargets():
+    module = sys.modules[__name__]
+    targets = [(module, '_parser', 'parse'), (module, 'valid', 'validate'), (module, 'extract', 'extract'),
+               (module, 'compare', 'compare'), (Matcher, 'match', 'match')]
+    return targets + [(Version, name, 'compare') for name in ('__eq__', '__lt__', '__le__', '__gt__', '__ge__')]
+
+
+def _timed(operation, function):
+    counter, clock, hooks = _profile[operation], time.perf_counter, _hooks
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        start = clock()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            elapsed = clock() - start
+            counter[0] += 1
+            counter[1] += elapsed
+            for hook in hooks: hook(operation, elapsed)
+    return wrapper
+
+
+def profileenable(hook=None):
+    """Starts counting calls and time of parsing, validation, comparison,
+    matching and extraction.
+    Does nothing (except adding the hook) if profiling is already enabled.
+
+    :param hook: optional callable called as `hook(operation, seconds)` after every counted call
+    """
+    if hook is not None: _hooks.append(hook)
+    if _profiled: return
+    for owner, name, operation in _profiletargets():
+        original = getattr(owner, name)
+        _profiled[(owner, name)] = original
+        setattr(owner, name, _timed(operation, original))
+
+
+def profiledisable():
+    """Stops profiling, restores original functions and removes hooks.
+    Collected statistics are kept.
+    """
+    for (owner, name), original in _profiled.items(): setattr(owner, name, original)
+    _profiled.clear()
+    del _hooks[:]
+
+
+def profileinfo():
+    """Returns dictionary mapping operations to `{'count': calls, 'time': seconds}`
+    dictionaries and `'cache'` to `{'hits': ..., 'misses': ..., 'hitrate': ...}`
+    describing Version() intern cache since statistics were cleared.
+    """
+    info = dict([(operation, {'count': count, 'time': seconds}) for operation, (count, seconds) in _profile.items()])
+    cache = _intern.cache_info()
+    info['cache'] = _cachestats(cache.hits - _cachebase[0], cache.misses - _cachebase[1])
+    return info
+
+
+def _cachestats(hits, misses):
+    hits, misses = max(0, hits), max(0, misses)
+    return {'hits': hits, 'misses': misses, 'hitrate': (hits / (hits + misses) if hits + misses else 0.0)}
+
+
+def profileclear():
+    """Resets profiling statistics.
+    """
+    for counter in _profile.values(): counter[:] = [0, 0.0]
+    cache = _intern.cache_info()
+    _cachebase[:] = [cache.hits, cache.misses]
+
+
+@contextlib.contextmanager
+def profiling(hook=None, export=None):
+    """Context manager profiling its body.
+    Yields dictionary which is filled with statistics of the body (in format of `profileinfo()`)
+    on exit. Profiling enabled before is left enabled.
+
+    :param hook: optional callable called as `hook(operation, seconds)` after every counted call
+    :param export: optional callable the statistics are passed to on exit
+    """
+    enabled = bool(_profiled)
+    before, stats = profileinfo(), {}
+    profileenable(hook)
+    try:
+        yield stats
+    finally:
+        if not enabled: profiledisable()
+        elif hook is not None: _hooks.remove(hook)
+        after = profileinfo()
+        for operation in operations:
+            stats[operation] = {'count': after[operation]['count'] - before[operation]['count'],
+                                'time': after[operation]['time'] - before[operation]['time']}
+        stats['cache'] = _cachestats(after['cache']['hits'] - before['cache']['hits'],
+                                     after['cache']['misses'] - before['cache']['misses'])
+        if export is not None: export(stats)
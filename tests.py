@@ -1,7 +1,19 @@
 #!/usr/bin/env python3
 
+import asyncio
+import concurrent.futures
+import functools
+import io
+import os
+import pickle
+import sqlite3
+import subprocess
+import sys
+import tempfile
 import unittest
-from pyversion.version import Version, Comparison, valid
+from pyversion import version, extraction, arrays, sets, index, store, parallel, binary, resolver, aio, diff
+from pyversion import __main__ as cli
+from pyversion.version import Version, Comparison, Matcher, valid, extract, pattern
 
 
 #   if set to True tests will be verbose
@@ -130,6 +142,80 @@ class ComparisonTests(unittest.TestCase):
             self.assertEqual(result, first <= second)
 
 
+class SortKeyTests(unittest.TestCase):
+    def testKey(self):
+        for first, second, result, strict in versions_to_compare_lt:
+            self.assertEqual(result, Version(first, strict=strict).key < Version(second, strict=strict).key)
+        for first, second, result, strict in versions_to_compare_gt:
+            self.assertEqual(result, Version(first, strict=strict).key > Version(second, strict=strict).key)
+
+    def testSorted(self):
+        ordered = ['1.0.0-alpha', '1.0.0-alpha.beta', '1.0.0-alpha.1', '1.0.0-beta',
+                   '1.0.0-beta.2', '1.0.0-beta.11', '1.0.0-rc.1', '1.0.0', '1.0.1']
+        shuffled = [Version(s) for s in reversed(ordered)]
+        self.assertEqual(ordered, [repr(v) for v in sorted(shuffled)])
+        self.assertEqual('1.0.1', repr(max(shuffled)))
+
+    def testSortedNonstandard(self):
+        ordered = ['1', '1.0', '1.0.0', '1.0.0.1-rc', '1.0.0.1']
+        versions = [Version(s, strict=False) for s in reversed(ordered)]
+        self.assertEqual(ordered, [repr(v) for v in sorted(versions, key=lambda v: v.key)])
+
+    def testBuildIgnored(self):
+        self.assertEqual(Version('1.0.0+1').key, Version('1.0.0+2').key)
+
+
+class ThreeWayComparisonTests(unittest.TestCase):
+    def testCompare(self):
+        self.assertEqual(-1, version.compare(Version('1.0.0-alpha.1'), Version('1.0.0-alpha.1.rel.3')))
+        self.assertEqual(1, version.compare(Version('1.0.0-beta.1'), Version('1.0.0-alpha.2')))
+        self.assertEqual(1, version.compare(Version('1.0.0-1'), Version('1.0.0-rc')))
+        self.assertEqual(0, version.compare(Version('1.0.0+1'), Version('1.0.0+2')))
+        self.assertEqual(-1, version.compare(Version('1.0', strict=False), Version('1.0.0', strict=False)))
+
+    def testConsistent(self):
+        versions = [Version(s, strict=False) for s in ['1', '1.0', '1.0.0', '1.0.0-1', '1.0.0-a', '1.0.0-a.1',
+                                                       '1.0.0-a.b', '1.0.0-b', '1.0.0-2', '0.9.9.9.9']]
+        for first in versions:
+            for second in versions:
+                result = version.compare(first, second)
+                self.assertEqual((first.key > second.key) - (first.key < second.key), result)
+                self.assertEqual(-result, version.compare(second, first))
+                self.assertEqual(result < 0, Comparison(first, second).lt())
+                self.assertEqual(result > 0, Comparison(first, second).gt())
+
+
+class BumpTests(unittest.TestCase):
+    def testBump(self):
+        v = Version('1.2.3-rc.1+build.7')
+        self.assertEqual('2.0.0', repr(v.bump('major')))
+        self.assertEqual('1.3.0', repr(v.bump('minor')))
+        self.assertEqual('1.2.4', repr(v.bump()))
+        self.assertRaises(ValueError, v.bump, 3)
+        self.assertRaises(ValueError, v.bump, 'build')
+
+    def testBumpNonstandard(self):
+        v = Version('1.2', strict=False)
+        self.assertEqual('1.2.0.1', repr(v.bump(3)))
+        self.assertEqual('1.3', repr(v.bump('minor')))
+        self.assertEqual(False, v.bump(3).strict)
+
+    def testPrerelease(self):
+        self.assertEqual('3.2.1-rc.9', repr(Version('3.2.1-rc.8').bumpprerelease()))
+        self.assertEqual('3.2.1-rc.0', repr(Version('3.2.1-rc').bumpprerelease()))
+        self.assertRaises(ValueError, Version('3.2.1').bumpprerelease)
+        self.assertEqual('3.2.1', repr(Version('3.2.1-rc.8+42').finalize()))
+        self.assertTrue(Version('3.2.1-rc.8').bumpprerelease() > Version('3.2.1-rc.8'))
+
+    def testBumpMany(self):
+        bumped = Version.bump_many(['1.2.3', '2.0.0', '1.2.3+b'])
+        self.assertEqual(['1.2.4', '2.0.1', '1.2.4'], [repr(v) for v in bumped])
+        self.assertEqual(['1.0.0-rc.2'], [repr(v) for v in Version.bump_many(['1.0.0-rc.1'], 'prerelease')])
+        bumped = Version.bump_many(['1.2', '2.0.9.1'], 'minor', strict=False)
+        self.assertEqual(['1.3', '2.1.0.0'], [repr(v) for v in bumped])
+        self.assertRaises(version.InvalidVersionStringError, Version.bump_many, ['1.2'], 'minor')
+
+
 class InitializationTests(unittest.TestCase):
     def testOnlyVersion(self):
         v = Version('3.9.3')
@@ -151,6 +237,195 @@ class InitializationTests(unittest.TestCase):
         self.assertEqual('42', v2.build)
 
 
+class ImmutabilityTests(unittest.TestCase):
+    def testHashable(self):
+        versions = set([Version('1.0.0'), Version('1.0.0+42'), Version('1.0.0-rc.1')])
+        self.assertEqual(2, len(versions))
+        self.assertIn(Version('1.0.0'), versions)
+        self.assertEqual('x', {Version('1.0.0-rc.1'): 'x'}[Version('1.0.0-rc.1')])
+
+    def testReadOnly(self):
+        v = Version('1.2.3-rc.1')
+        self.assertRaises(AttributeError, setattr, v, 'major', 4)
+        self.assertRaises(AttributeError, setattr, v, 'anything', 4)
+        v.prerelease.append('x')
+        self.assertEqual(['rc', 1], v.prerelease)
+
+    def testPickle(self):
+        v = Version('1.2.3.4-rc.1+7', strict=False)
+        copy = pickle.loads(pickle.dumps(v))
+        self.assertEqual(v, copy)
+        self.assertEqual('1.2.3.4-rc.1+7', repr(copy))
+        self.assertEqual(False, copy.strict)
+
+    def testMissingComponents(self):
+        v = Version('3', strict=False)
+        self.assertEqual((3, -1, -1), (v.major, v.minor, v.patch))
+
+
+class InternCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.maxsize = version.cacheinfo().maxsize
+        version.cacheclear()
+
+    def tearDown(self):
+        version.cacheresize(self.maxsize)
+
+    def testShared(self):
+        self.assertIs(Version('1.2.3-rc.1'), Version('1.2.3-rc.1'))
+        self.assertIsNot(Version('1.2.3'), Version('1.2.3', strict=False))
+
+    def testStatistics(self):
+        Version('1.2.3')
+        Version('1.2.3')
+        Version('1.2.4')
+        info = version.cacheinfo()
+        self.assertEqual((1, 2, 2), (info.hits, info.misses, info.currsize))
+
+    def testResize(self):
+        version.cacheresize(1)
+        first = Version('1.2.3')
+        Version('1.2.4')
+        self.assertIsNot(first, Version('1.2.3'))
+        self.assertEqual(1, version.cacheinfo().currsize)
+
+    def testInvalidNotCached(self):
+        self.assertRaises(version.InvalidVersionStringError, Version, '1.2')
+        self.assertEqual(0, version.cacheinfo().currsize)
+
+
+class ComparatorTests(unittest.TestCase):
+    strings = ['1.0.0', '1.0.0-rc.1', '1.0.0-rc.a', '0.9.0', '2.0.0-alpha.1.rel.3', '2.0.0-alpha.1']
+
+    def testResults(self):
+        comparator = version.Comparator()
+        versions = [Version(s) for s in self.strings]
+        for first in versions:
+            for second in versions:
+                self.assertEqual(version.compare(first, second), comparator(first, second))
+                self.assertEqual(version.compare(first, second), comparator(first, second))
+        info = comparator.cacheinfo()
+        self.assertEqual((36, 36, 4096, 36), (info.hits, info.misses, info.maxsize, info.currsize))
+        self.assertEqual(sorted(versions), sorted(versions, key=functools.cmp_to_key(comparator)))
+
+    def testEviction(self):
+        comparator = version.Comparator(maxsize=2)
+        a, b, c = Version('1.0.0'), Version('2.0.0'), Version('3.0.0')
+        comparator(a, b)
+        comparator(a, c)
+        comparator(a, b)
+        comparator(b, c)
+        self.assertEqual(2, comparator.cacheinfo().currsize)
+        comparator(a, b)
+        comparator(a, c)
+        self.assertEqual((2, 4), comparator.cacheinfo()[:2])
+        comparator.cacheclear()
+        self.assertEqual((0, 0, 2, 0), tuple(comparator.cacheinfo()))
+
+    def testUnbounded(self):
+        comparator = version.Comparator(maxsize=None)
+        versions = [Version(s) for s in self.strings]
+        for first in versions:
+            for second in versions: comparator(first, second)
+        self.assertEqual((0, 36, None, 36), tuple(comparator.cacheinfo()))
+        comparator(versions[0], versions[1])
+        self.assertEqual(1, comparator.cacheinfo().hits)
+
+    def testComparison(self):
+        comparator = version.Comparator()
+        first, second = Version('1.0.0-rc.1'), Version('1.0.0')
+        self.assertTrue(Comparison(first, second, comparator).lt())
+        self.assertFalse(Comparison(first, second, comparator).ge())
+        self.assertEqual(1, comparator.cacheinfo().hits)
+
+
+class ProfilingTests(unittest.TestCase):
+    def setUp(self):
+        version.cacheclear()
+        version.profileclear()
+
+    def tearDown(self):
+        version.profiledisable()
+
+    def testCounters(self):
+        events, exported = [], []
+        hook = lambda operation, seconds: events.append(operation)
+        with version.profiling(hook=hook, export=exported.append) as stats:
+            Version('9.8.7')
+            Version('9.8.7')
+            version.valid('1.0.0')
+            version.extract('release 1.0.0')
+            self.assertTrue(Comparison(Version('9.8.7'), Version('1.0.0')).gt())
+            self.assertTrue(Version('1.0.0') < Version('9.8.7'))
+            self.assertTrue(Matcher(min='1.0.0').match(Version('9.8.7')))
+        self.assertEqual([stats], exported)
+        counts = dict([(operation, stats[operation]['count']) for operation in version.operations])
+        self.assertEqual({'parse': 2, 'validate': 1, 'compare': 2, 'match': 1, 'extract': 1}, counts)
+        self.assertEqual(7, len(events))
+        self.assertEqual({'hits': 6, 'misses': 2, 'hitrate': 0.75}, stats['cache'])
+        self.assertEqual(2, version.profileinfo()['parse']['count'])
+
+    def testDisabled(self):
+        originals = (version._parser, version.valid, Version.__lt__, Matcher.match)
+        version.profileenable()
+        self.assertNotEqual(originals, (version._parser, version.valid, Version.__lt__, Matcher.match))
+        self.assertEqual(hash(Version('1.0.0')), hash(Version('1.0.0', strict=False)))
+        version.profiledisable()
+        self.assertEqual(originals, (version._parser, version.valid, Version.__lt__, Matcher.match))
+        Version('1.0.0') < Version('2.0.0')
+        self.assertEqual(0, version.profileinfo()['compare']['count'])
+
+    def testUseParser(self):
+        with version.profiling() as stats:
+            version.useparser('regexp')
+            Version('7.7.7')
+            version.useparser('scanner')
+            Version('7.7.8')
+        self.assertEqual(2, stats['parse']['count'])
+        self.assertIs(version._scanparse, version._parser)
+
+
+class ParserTests(unittest.TestCase):
+    strings = ['1.2.3', '01.002.3', '1.2', '1', '1.2.3.4', '1.2.3-rc.1', '1.2.3-rc-1.07+build-7.x',
+               '1.2.3+build', '1.2.3-', '1.2.3+', '1.2.3-rc..1', '1..3', '.1.2', '1.2.3.', '1.2.a',
+               '1.2.3-rc.1+a+b', '1.2.3-ä', '1.2.３', '1.2.3\n', '1.2.3\n\n', '1.2.3-rc\n', '',
+               '-rc.1', '1.2.3-+', '28.0.1500.95-1', '1.2.3 ', ' 1.2.3', '1.2.3-alpha.beta-.--']
+
+    def parse(self, parser, string, strict):
+        try: return parser(string, strict)
+        except Exception as e: return type(e)
+
+    def testDifferential(self):
+        for strict in (True, False):
+            for string in self.strings:
+                if DEBUG: print(repr(string), strict)
+                self.assertEqual(self.parse(version._regexpparse, string, strict),
+                                 self.parse(version._scanparse, string, strict))
+
+    def testUseParser(self):
+        try:
+            version.useparser('regexp')
+            self.assertEqual(((1, 2, 3), ('rc', 1), 'b'), version._parser('1.2.3-rc.1+b', True))
+        finally:
+            version.useparser('scanner')
+        self.assertRaises(ValueError, version.useparser, 'nonexistent')
+
+
+class ParseManyTests(unittest.TestCase):
+    def testParseMany(self):
+        versions, errors = Version.parse_many(['1.2.3', '1.2', '1.2.3-rc.1', '1.2.3', 'x'])
+        self.assertEqual(['1.2.3', '1.2.3-rc.1', '1.2.3'], [repr(v) for v in versions])
+        self.assertIs(versions[0], versions[2])
+        self.assertEqual([1, 4], [index for index, string, reason in errors])
+        self.assertEqual((1, '1.2', 'invalid version string: 1.2'), errors[0])
+
+    def testParseManyNonstandard(self):
+        versions, errors = Version.parse_many(iter(['1.2', '1.2.3.4-rc.1', '1..2']), strict=False)
+        self.assertEqual([(1, 2), (1, 2, 3, 4)], [tuple(v.base) for v in versions])
+        self.assertEqual(False, versions[0].strict)
+        self.assertEqual([(2, '1..2', 'invalid version string: 1..2')], errors)
+
+
 class NonstandardInitializationTests(unittest.TestCase):
     def testVersionAndPrerelease(self):
         v = Version('3.9.3.0-alpha.1.release.3', strict=False)
@@ -189,6 +464,20 @@ class SatisfactionTests(unittest.TestCase):
         self.assertEqual(True, v.satisfies())
 
 
+class MatcherTests(unittest.TestCase):
+    def testVersionObjects(self):
+        matcher = Matcher(min=Version('1.0.0'), max='2.0.0', but=[Version('1.5.0+7')])
+        self.assertEqual(True, matcher.match(Version('1.4.0')))
+        self.assertEqual(False, matcher.match(Version('1.5.0')))
+        self.assertEqual(False, matcher.match('2.0.1'))
+        self.assertEqual(True, matcher.match(Version('1.0.0.0', strict=False)))
+
+    def testFilter(self):
+        matcher = Matcher(min='1.0.0-rc.1', max='1.0.0', but=['1.0.0-rc.2'])
+        candidates = ['0.9.0', '1.0.0-rc.1', '1.0.0-rc.2', '1.0.0-rc.10', Version('1.0.0+build'), '1.0.1']
+        self.assertEqual(['1.0.0-rc.1', '1.0.0-rc.10', '1.0.0+build'], [repr(v) for v in matcher.filter(candidates)])
+
+
 class NonstandardSatisfactionTests(unittest.TestCase):
     def testMinimal(self):
         v = Version('3.2.1.0', strict=False)
@@ -263,4 +552,552 @@ class ValidationTests(unittest.TestCase):
             self.assertEqual(False, valid(i))
 
 
+class PatternTests(unittest.TestCase):
+    def testGroups(self):
+        match = pattern().match('3.9.2-rc.6+build.2')
+        self.assertEqual(('3', '9', '2'), match.group('major', 'minor', 'patch'))
+        self.assertEqual('rc.6', match.group('prerelease'))
+        self.assertEqual('build.2', match.group('build'))
+
+    def testGroupsNonstandard(self):
+        match = pattern(strict=False).match('3.9-rc.6')
+        self.assertEqual('3.9', match.group('base'))
+        self.assertEqual(None, match.group('patch'))
+
+    def testBuildWithHyphen(self):
+        v = Version('1.0.0+build-7')
+        self.assertEqual([], v.prerelease)
+        self.assertEqual('build-7', v.build)
+
+    def testExtract(self):
+        self.assertEqual('3.2.1-rc.7', extract('3.2.1-rc.7'))
+        self.assertEqual('', extract('3.2.1.0'))
+        self.assertEqual('3.2.1.0', extract('3.2.1.0', strict=False))
+
+
+class LazyImportTests(unittest.TestCase):
+    def loaded(self, statements):
+        """Returns names of modules loaded by statements in a fresh interpreter.
+        """
+        script = ('import sys\nbefore = set(sys.modules)\n{0}\n'
+                  'print(" ".join(sorted(set(sys.modules) - before)))').format(statements)
+        root = os.path.dirname(os.path.abspath(__file__))
+        return subprocess.check_output([sys.executable, '-c', script], cwd=root).decode().split()
+
+    def testPackage(self):
+        self.assertEqual(['pyversion'], self.loaded('import pyversion'))
+
+    def testVersionWithoutRegexp(self):
+        loaded = self.loaded('from pyversion.version import Version, Matcher\n'
+                             'Matcher(min="1.0.0").match(Version("1.2.3-rc.1"))')
+        self.assertNotIn('re', loaded)
+        self.assertNotIn('numpy', loaded)
+        self.assertIn('re', self.loaded('import pyversion\npyversion.version.valid("1.0.0")'))
+
+    def testAttributes(self):
+        self.assertIs(version.pattern(), version.match_regexp)
+        self.assertIs(version.pattern(strict=False), version.permissive_pattern)
+        self.assertTrue(version.valid_identifier_regexp.match('rc-1'))
+        self.assertRaises(AttributeError, getattr, version, 'no_such_pattern')
+        import pyversion
+        self.assertIs(sets, pyversion.sets)
+        self.assertRaises(AttributeError, getattr, pyversion, 'no_such_module')
+
+
+class ExtractionTests(unittest.TestCase):
+    text = ('pyversion-0.3.1.tar.gz v1.2.3 x1.2.3 1.2.3.4 (2.0.0-rc.1+b.7). 3.4.5-.\n'
+            'released 10.0.0-alpha.beta.\n')
+    found = [(10, '0.3.1'), (24, '1.2.3'), (46, '2.0.0-rc.1+b.7'), (80, '10.0.0-alpha.beta')]
+
+    def testBuffer(self):
+        self.assertEqual(self.found, [(o, repr(v)) for o, v in extraction.finditer(self.text.encode())])
+
+    def testChunkBoundaries(self):
+        for chunksize in range(1, 32):
+            for stream in (io.StringIO(self.text), io.BytesIO(self.text.encode())):
+                found = extraction.finditer(stream, chunksize=chunksize, overlap=24)
+                self.assertEqual(self.found, [(o, repr(v)) for o, v in found])
+
+    def testChunkBoundaryInBuild(self):
+        # the pattern backtracks to `1.0.0-alpha` when the chunk ends right after `+`
+        text = 'released 1.0.0-alpha.beta+exp.sha.5114f85 and 2.0.0-rc.1+b.7'
+        found = [(9, '1.0.0-alpha.beta+exp.sha.5114f85'), (46, '2.0.0-rc.1+b.7')]
+        self.assertEqual(found, [(o, repr(v)) for o, v in extraction.finditer(text.encode())])
+        for chunksize in range(1, len(text) + 1):
+            for stream in (io.StringIO(text), io.BytesIO(text.encode())):
+                self.assertEqual(found, [(o, repr(v)) for o, v in extraction.finditer(stream, chunksize=chunksize)])
+
+    def testPath(self):
+        ifstream = tempfile.NamedTemporaryFile(delete=False)
+        try:
+            ifstream.write(self.text.encode())
+            ifstream.close()
+            self.assertEqual(self.found, [(o, repr(v)) for o, v in extraction.finditer(ifstream.name)])
+        finally:
+            os.unlink(ifstream.name)
+
+    def testNonstandard(self):
+        found = extraction.extractall(io.StringIO('builds 1.2, 3.2.1.0-rc.7 and 42.'), strict=False)
+        self.assertEqual(['1.2', '3.2.1.0-rc.7', '42'], [repr(v) for v in found])
+
+
+class VersionSetTests(unittest.TestCase):
+    def setUp(self):
+        # 1.2.x or >=2.4 except 2.5.1
+        self.policy = (sets.VersionSet.range('1.2.0', '1.3.0', maxinclusive=False)
+                       | sets.VersionSet.range(min='2.4.0')) - Matcher(min='2.5.1', max='2.5.1')
+
+    def testMembership(self):
+        for string, result in [('1.1.9', False), ('1.2.0', True), ('1.2.17', True), ('1.3.0', False),
+                               ('2.3.0', False), ('2.4.0', True), ('2.5.1', False), ('2.5.1+b', False),
+                               ('2.5.2', True), ('99.0.0', True)]:
+            self.assertEqual(result, string in self.policy)
+
+    def testNormalisation(self):
+        joined = sets.VersionSet([('1.0.0', True, '2.0.0', False), ('2.0.0', True, '3.0.0', True),
+                                  ('1.5.0', True, '1.6.0', True)])
+        self.assertEqual(sets.VersionSet.range('1.0.0', '3.0.0'), joined)
+        apart = sets.VersionSet([('1.0.0', True, '2.0.0', False), ('2.0.0', False, '3.0.0', True)])
+        self.assertEqual(2, len(apart.intervals))
+
+    def testOperations(self):
+        everything = sets.VersionSet.all()
+        self.assertEqual(everything, self.policy | ~self.policy)
+        self.assertEqual(sets.VersionSet.empty(), self.policy & ~self.policy)
+        self.assertEqual(self.policy, ~~self.policy)
+        self.assertEqual(['2.5.1'], [repr(v) for v in (~self.policy & sets.VersionSet.range('2.5.0', '2.6.0'))
+                                     .filter(['2.5.0', '2.5.1', '2.5.2'])])
+
+    def testFromMatcher(self):
+        matcher = Matcher(min='1.0.0', max='2.0.0', but=['1.5.0'])
+        versionset = sets.VersionSet.frommatcher(matcher)
+        for string in ['0.9.0', '1.0.0', '1.5.0', '1.5.1', '2.0.0', '2.0.1']:
+            self.assertEqual(matcher.match(string), string in versionset)
+
+
+class MatcherIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.matchers = [Matcher(min='{0}.0.0'.format(i), max='{0}.9.0'.format(i + 2), but=['{0}.5.0'.format(i + 1)])
+                         for i in range(100)]
+        self.matchers.append(Matcher(max='3.0.0'))
+        self.matchers.append(Matcher(min='97.0.0-rc.1'))
+        self.index = index.MatcherIndex(self.matchers)
+
+    def expected(self, string):
+        return [m for m in self.matchers if m in self.index and m.match(string)]
+
+    def testQuery(self):
+        for string in ['0.0.1', '1.5.0', '2.9.0', '50.1.0', '97.0.0', '101.9.0', '102.0.0', '97.0.0-rc.1']:
+            self.assertEqual(set(map(id, self.expected(string))), set(map(id, self.index.query(string))))
+
+    def testInsertAndRemove(self):
+        for matcher in self.matchers[::2]: self.index.remove(matcher)
+        extra = [Matcher(min='50.0.0', max='50.0.0') for i in range(100)]
+        for matcher in extra: self.index.add(matcher)
+        self.matchers.extend(extra)
+        self.assertEqual(151, len(self.index))
+        self.assertEqual(set(map(id, self.expected('50.0.0'))), set(map(id, self.index.query('50.0.0'))))
+        self.assertRaises(KeyError, self.index.remove, self.matchers[0])
+
+    def testEmptyRange(self):
+        empty = Matcher(min='2.0.0', max='1.0.0')
+        self.assertEqual([], index.MatcherIndex([empty]).query('1.5.0'))
+        for i in range(100): self.index.add(Matcher(min='2.0.0', max='1.0.0'))
+        self.index.add(empty)
+        self.assertIn(empty, self.index)
+        self.assertEqual(set(map(id, self.expected('2.0.0'))), set(map(id, self.index.query('2.0.0'))))
+        self.assertEqual([[]], index.MatcherIndex([empty]).querymany(['1.5.0']))
+        self.index.remove(empty)
+
+    def testQueryMany(self):
+        strings = ['50.1.0', '0.0.1', '51.5.0', '3.0.0', '200.0.0']
+        for string, found in zip(strings, self.index.querymany(strings)):
+            self.assertEqual(set(map(id, self.expected(string))), set(map(id, found)))
+
+
+class VersionStoreTests(unittest.TestCase):
+    def setUp(self):
+        self.store = store.VersionStore(['2.0.0', '1.0.0', '3.1.0-rc.1', '3.0.0+b.1', '2.1.0', '3.0.0', '1.5.0'])
+
+    def testOrder(self):
+        self.store.add('3.0.0+b.2')
+        self.store.add(Version('0.1.0'))
+        self.assertEqual(['0.1.0', '1.0.0', '1.5.0', '2.0.0', '2.1.0', '3.0.0+b.1', '3.0.0', '3.0.0+b.2', '3.1.0-rc.1'],
+                         [repr(v) for v in self.store])
+        self.store.remove('3.0.0')
+        self.assertEqual(8, len(self.store))
+        self.assertRaises(ValueError, self.store.remove, '3.0.0+b.9')
+
+    def testLatest(self):
+        self.assertEqual('3.0.0', repr(self.store.latest()))
+        self.assertEqual('3.1.0-rc.1', repr(self.store.latest(include_prerelease=True)))
+        matcher = Matcher(min='2.0.0', max='3.0.0', but=['3.0.0'])
+        self.assertEqual('2.1.0', repr(self.store.latest(matcher=matcher)))
+        for v in ['2.100000.0', '3.0.0-rc.1']: self.store.add(v)
+        self.assertEqual('2.100000.0', repr(self.store.latest(matcher=matcher)))
+        self.assertEqual(None, store.VersionStore().latest())
+
+    def testNeighbours(self):
+        self.assertEqual('2.0.0', repr(self.store.floor('2.0.5')))
+        self.assertEqual('2.0.0', repr(self.store.floor('2.0.0')))
+        self.assertEqual('2.1.0', repr(self.store.ceiling('2.0.5')))
+        self.assertEqual('1.5.0', repr(self.store.before('2.0.0')))
+        self.assertEqual('2.1.0', repr(self.store.after('2.0.0')))
+        self.assertEqual(None, self.store.floor('0.0.1'))
+        self.assertEqual(None, self.store.after('4.0.0'))
+        self.assertIn('3.0.0', self.store)
+
+    def testRange(self):
+        self.assertEqual(['1.5.0', '2.1.0'], [repr(v) for v in self.store.range('1.5.0', '2.1.0', but=['2.0.0'])])
+        self.assertEqual(['3.0.0+b.1', '3.0.0', '3.1.0-rc.1'], [repr(v) for v in self.store.range(min='3.0.0')])
+
+
+class ParallelTests(unittest.TestCase):
+    strings = ['{0}.{1}.{2}{3}'.format(i % 7, i % 5, i % 3, ['', '-rc.1', '+b', '-a.2+c', 'x'][i % 5])
+               for i in range(500)]
+
+    def testParse(self):
+        self.assertEqual(Version.parse_many(self.strings),
+                         parallel.parse(self.strings, workers=2, chunksize=64, threshold=0))
+
+    def testSort(self):
+        versions, errors = parallel.sort(self.strings, workers=2, chunksize=64, threshold=0)
+        expected = sorted(Version.parse_many(self.strings)[0])
+        self.assertEqual([repr(v) for v in expected], [repr(v) for v in versions])
+        self.assertEqual(100, len(errors))
+        self.assertEqual((versions, errors), parallel.sort(self.strings))
+
+    def testValidate(self):
+        self.assertEqual([valid(s) for s in self.strings], parallel.validate(self.strings, workers=1))
+
+
+class BinaryTests(unittest.TestCase):
+    strings = ['1.2.3', '3.2.1-rc.8+build.42', '3.2.1-rc.12', '0.0.1-alpha.1.rel.3', '300.70000.123456789']
+
+    def testRoundTrip(self):
+        catalogue = binary.loads(binary.dumps(self.strings))
+        self.assertEqual(False, catalogue.sorted)
+        self.assertEqual(self.strings, [repr(v) for v in catalogue])
+        self.assertEqual('300.70000.123456789', repr(catalogue[-1]))
+        self.assertRaises(IndexError, catalogue.__getitem__, 5)
+        self.assertIn('3.2.1-rc.12', catalogue)
+
+    def testSorted(self):
+        catalogue = binary.loads(binary.dumps(self.strings, sort=True, build=False))
+        self.assertEqual(sorted([Version(s) for s in self.strings]), list(catalogue))
+        self.assertEqual('', catalogue[2].build)
+        self.assertEqual(2, catalogue.index('3.2.1-rc.8'))
+        self.assertNotIn('3.2.1-rc.9', catalogue)
+
+    def testStrictness(self):
+        strings = ['1.2', '1.2.3', '3.2.1.0-rc.1']
+        for sort in (False, True):
+            catalogue = binary.loads(binary.dumps(strings, sort=sort, strict=False))
+            self.assertEqual(False, catalogue.strict)
+            self.assertIn('1.2', catalogue)
+            self.assertIn(Version('1.2.3'), catalogue)
+            self.assertNotIn('1.2.4', catalogue)
+        self.assertEqual(True, binary.loads(binary.dumps(self.strings)).strict)
+        self.assertEqual(False, binary.loads(binary.dumps([Version('1.2', strict=False)])).strict)
+
+    def testSingle(self):
+        v = binary.decode(binary.encode(Version('3.9.3.0-release.4+build.42', strict=False)))
+        self.assertEqual('3.9.3.0-release.4+build.42', repr(v))
+        self.assertEqual(False, v.strict)
+
+    def testFile(self):
+        ofstream = tempfile.NamedTemporaryFile(delete=False)
+        ofstream.close()
+        try:
+            binary.dump(self.strings, ofstream.name, sort=True)
+            catalogue = binary.load(ofstream.name)
+            self.assertEqual(len(self.strings), len(catalogue))
+            self.assertEqual('300.70000.123456789', repr(catalogue[-1]))
+            del catalogue
+        finally:
+            os.unlink(ofstream.name)
+
+    def testInvalid(self):
+        self.assertRaises(binary.CatalogueError, binary.loads, b'nothing')
+        self.assertRaises(binary.CatalogueError, binary.fromsortkey, b'\x02\x01\x01\x01')
+        self.assertRaises(binary.CatalogueError, binary.fromsortkey, b'')
+
+    def testSortKey(self):
+        strings = ['1.0', '1.0.0', '1.0.0-1', '1.0.0-a', '1.0.0-a.1', '1.0.0-a.b', '1.0.0-ab', '1.0.0-b', '1.0.0.0',
+                   '1.0.256', '1.0.1000000000000', '2']
+        versions = sorted([Version(s, strict=False) for s in strings])
+        keys = [binary.sortkey(v) for v in versions]
+        self.assertEqual(sorted(keys), keys)
+        self.assertEqual(len(keys), len(set(keys)))
+        self.assertEqual(versions, [binary.fromsortkey(k) for k in keys])
+        self.assertEqual(binary.sortkey('1.0.0+b.7'), binary.sortkey('1.0.0'))
+        self.assertEqual((True, False), (binary.fromsortkey(keys[1]).strict, binary.fromsortkey(keys[0]).strict))
+
+    def testBounds(self):
+        connection = sqlite3.connect(':memory:')
+        connection.execute('CREATE TABLE versions (key BLOB PRIMARY KEY, string TEXT)')
+        connection.executemany('INSERT INTO versions VALUES (?, ?)', [(binary.sortkey(s), s) for s in self.strings])
+        query = 'SELECT string FROM versions WHERE key BETWEEN ? AND ? ORDER BY key'
+        self.assertEqual([('1.2.3',), ('3.2.1-rc.8+build.42',), ('3.2.1-rc.12',)],
+                         connection.execute(query, binary.bounds(Matcher(min='1.0.0', max='3.2.1-rc.12'))).fetchall())
+        self.assertEqual(5, len(connection.execute(query, binary.bounds(Matcher())).fetchall()))
+
+
+class DiffTests(unittest.TestCase):
+    old = ['0.9.0', '1.0.0+a', '1.0.0+b', '1.1.0-rc.1', '1.1.0', '2.0.0+x']
+    new = ['1.0.0+b', '1.0.0+c', '1.1.0', '1.2.0', '2.0.0+y']
+
+    def testDiff(self):
+        changes = [(change, a and repr(a), b and repr(b)) for change, a, b in diff.diff(self.old, self.new)]
+        self.assertEqual([(diff.REMOVED, '0.9.0', None), (diff.CHANGED, '1.0.0+a', '1.0.0+c'),
+                          (diff.REMOVED, '1.1.0-rc.1', None), (diff.ADDED, None, '1.2.0'),
+                          (diff.CHANGED, '2.0.0+x', '2.0.0+y')], changes)
+        self.assertEqual([], list(diff.diff(self.new, iter(self.new))))
+        self.assertEqual(len(self.new), len(list(diff.diff([], self.new))))
+
+    def testDuplicates(self):
+        changes = [(change, a and repr(a), b and repr(b)) for change, a, b in
+                   diff.diff(['1.0.0+a', '1.0.0+a', '1.0.0+b'], ['1.0.0+a', '1.0.0+c', '1.0.0+c'])]
+        self.assertEqual([(diff.CHANGED, '1.0.0+a', '1.0.0+c'), (diff.CHANGED, '1.0.0+b', '1.0.0+c')], changes)
+        changes = list(diff.diff(['1.0.0+a', '1.0.0+a'], ['1.0.0+a']))
+        self.assertEqual([(diff.REMOVED, Version('1.0.0+a'), None)], changes)
+
+    def testUnsorted(self):
+        self.assertRaises(ValueError, list, diff.diff(['2.0.0', '1.0.0'], []))
+
+    def testFiles(self):
+        paths = []
+        try:
+            for versions in (self.old, self.new):
+                with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as ofstream:
+                    ofstream.write('\n'.join(versions) + '\n\n')
+                paths.append(ofstream.name)
+            self.assertEqual(5, len(list(diff.difffiles(*paths))))
+        finally:
+            for path in paths: os.unlink(path)
+        catalogues = [binary.loads(binary.dumps(versions, sort=True)) for versions in (self.old, self.new)]
+        self.assertEqual(5, len(list(diff.diff(*catalogues))))
+
+
+class CommandLineTests(unittest.TestCase):
+    lines = ['1.0.0\n', '2.0.0-rc.1\n', '\n', '1.0.0+b\n', '0.9.0\n', '2.0.0\n']
+
+    def run_cli(self, command, lines=None, **options):
+        output = io.StringIO()
+        code = cli.run(command, iter(lines or self.lines), output, **options)
+        return (code, output.getvalue().split())
+
+    def testSort(self):
+        self.assertEqual((0, ['0.9.0', '1.0.0', '1.0.0+b', '2.0.0-rc.1', '2.0.0']), self.run_cli('sort'))
+        self.assertEqual((0, ['2.0.0', '2.0.0-rc.1', '1.0.0', '0.9.0']), self.run_cli('unique', reverse=True))
+
+    def testMaxMin(self):
+        self.assertEqual((0, ['2.0.0']), self.run_cli('max'))
+        self.assertEqual((0, ['0.9.0']), self.run_cli('min'))
+        self.assertEqual((1, []), self.run_cli('max', lines=['\n']))
+
+    def testFilter(self):
+        matcher = Matcher(min='1.0.0', but=['2.0.0'])
+        self.assertEqual((0, ['1.0.0', '2.0.0-rc.1']), self.run_cli('filter', matcher=matcher, dedupe=True))
+
+    def testInvalid(self):
+        lines = ['1.2\n', '1.2.3\n']
+        self.assertRaises(version.InvalidVersionStringError, self.run_cli, 'sort', lines=lines)
+        self.assertEqual((0, ['1.2.3']), self.run_cli('sort', lines=lines, skip=True))
+        self.assertEqual((0, ['1.2', '1.2.3']), self.run_cli('sort', lines=lines, strict=False))
+
+    def testInvalidBound(self):
+        stderr, sys.stderr = sys.stderr, io.StringIO()
+        try:
+            self.assertEqual(2, cli.main(['max', os.devnull, '--min', '1.2']))
+            self.assertIn('pyversion: invalid --min', sys.stderr.getvalue())
+        finally:
+            sys.stderr = stderr
+
+    def testMissingFile(self):
+        stderr, sys.stderr = sys.stderr, io.StringIO()
+        try:
+            self.assertEqual(2, cli.main(['sort', 'missing.txt']))
+            self.assertEqual("pyversion: missing.txt: No such file or directory\n", sys.stderr.getvalue())
+        finally:
+            sys.stderr = stderr
+
+    def testBrokenPipe(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as ofstream:
+            ofstream.write(''.join(['1.{0}.0\n'.format(i) for i in range(100000)]))
+        try:
+            root = os.path.dirname(os.path.abspath(__file__))
+            process = subprocess.Popen([sys.executable, '-m', 'pyversion', 'sort', ofstream.name], cwd=root,
+                                       stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            self.assertEqual(b'1.0.0\n', process.stdout.readline())
+            process.stdout.close()
+            self.assertEqual(b'', process.stderr.read())
+            process.stderr.close()
+            self.assertEqual(1, process.wait())
+        finally:
+            os.unlink(ofstream.name)
+
+
+class ResolverTests(unittest.TestCase):
+    catalogues = {'app': ['1.0.0', '2.0.0'], 'lib': ['1.0.0', '1.5.0', '2.0.0'], 'util': ['1.0.0', '3.0.0']}
+    dependencies = {
+        ('app', '2.0.0'): {'lib': Matcher(min='2.0.0'), 'util': Matcher(max='1.9.0')},
+        ('app', '1.0.0'): {'lib': Matcher(min='1.0.0', max='1.9.9')},
+        ('lib', '2.0.0'): {'util': Matcher(min='2.0.0')},
+        ('lib', '1.5.0'): {'util': Matcher(min='3.0.0')},
+    }
+
+    def testNewestConsistent(self):
+        result = resolver.resolve(self.catalogues, {'app': Matcher()}, self.dependencies)
+        self.assertEqual({'app': Version('1.0.0'), 'lib': Version('1.5.0'), 'util': Version('3.0.0')}, result)
+
+    def testUnsatisfiable(self):
+        requirements = {'app': Matcher(), 'util': Matcher(max='2.0.0'), 'lib': Matcher(min='1.5.0')}
+        self.assertRaises(resolver.ResolutionError, resolver.resolve, self.catalogues, requirements, self.dependencies)
+        self.assertRaises(resolver.ResolutionError, resolver.resolve, self.catalogues, {'missing': Matcher()})
+
+    def testBackjump(self):
+        # 'a' is decided first, then unrelated 'p' and 'q', and only 'z' (required by the newest 'q')
+        # reveals conflict with 'a' with no alternatives of 'p' worth trying
+        catalogues = {'a': ['1.0.0', '2.0.0'], 'p': ['1.0.0', '2.0.0', '3.0.0'], 'q': ['1.0.0', '2.0.0', '3.0.0'],
+                      'z': ['1.0.0', '2.0.0']}
+        dependencies = lambda package, v: ({'z': Matcher(min='2.0.0')} if package == 'q' else
+                                           {'z': Matcher(max='1.0.0')} if (package, str(v)) == ('a', '2.0.0') else {})
+        solver = resolver.Resolver(catalogues, dependencies)
+        result = solver.resolve({'a': Matcher(), 'p': Matcher(), 'q': Matcher()})
+        self.assertEqual(Version('1.0.0'), result['a'])
+        self.assertEqual(Version('3.0.0'), result['p'])
+        self.assertLess(0, solver.stats['backjumps'])
+
+    def testDeepChain(self):
+        catalogues = dict([('p{0}'.format(i), ['1.0.0', '2.0.0']) for i in range(1500)])
+        dependencies = lambda package, v: ({} if package == 'p1499' else
+                                           {'p{0}'.format(int(package[1:]) + 1): Matcher(max='1.0.0')})
+        result = resolver.resolve(catalogues, {'p0': Matcher()}, dependencies)
+        self.assertEqual(1500, len(result))
+        self.assertEqual((Version('2.0.0'), Version('1.0.0')), (result['p0'], result['p1499']))
+
+    def testCandidates(self):
+        solver = resolver.Resolver({'lib': ['1.{0}.0'.format(i) for i in range(20)]})
+        matchers = [Matcher(min='1.3.0'), Matcher(max='1.7.0', but=['1.6.0']), Matcher(min='1.2.0', but=['1.4.0'])]
+        self.assertEqual(['1.7.0', '1.5.0', '1.3.0'], [repr(v) for v in solver.candidates('lib', matchers)])
+        self.assertEqual((), solver.candidates('lib', [Matcher(min='2.0.0', max='1.0.0')]))
+        self.assertEqual((), solver.candidates('missing', []))
+
+    def testCacheSize(self):
+        catalogues = dict([('p{0}'.format(i), ['1.0.0', '2.0.0']) for i in range(300)])
+        dependencies = lambda package, v: ({} if package == 'p299' else
+                                           {'p{0}'.format(int(package[1:]) + 1): Matcher(max='1.0.0')})
+        solver = resolver.Resolver(catalogues, dependencies)
+        solver.resolve({'p0': Matcher()})
+        size = len(solver._cache)
+        for i in range(2): solver.resolve({'p0': Matcher()})
+        self.assertEqual(size, len(solver._cache))
+        self.assertEqual(0, solver.stats['misses'])
+        solver = resolver.Resolver(catalogues, dependencies, cachesize=10)
+        for i in range(2): solver.resolve({'p0': Matcher()})
+        self.assertEqual(size, len(solver._cache))
+
+    def testBudget(self):
+        solver = resolver.Resolver(self.catalogues, self.dependencies)
+        self.assertRaises(resolver.ResolutionBudgetError, solver.resolve, {'app': Matcher()}, budget=1)
+        solver.resolve({'app': Matcher()})
+        self.assertEqual(['backjumps', 'backtracks', 'hits', 'misses', 'states'], sorted(solver.stats))
+        self.assertLess(0, solver.stats['hits'])
+
+
+class AsyncTests(unittest.TestCase):
+    strings = ['1.0.0', '2.0.0-rc.1', '0.9.0', '3.0.0+b', '1.2.3']
+
+    def collect(self, stream):
+        async def consume():
+            return [v async for v in stream]
+        return asyncio.run(consume())
+
+    async def source(self, strings):
+        for string in strings: yield string
+
+    def testParse(self):
+        expected = [Version(s) for s in self.strings]
+        self.assertEqual(expected, self.collect(aio.parse(self.source(self.strings), chunksize=2)))
+        self.assertEqual(expected, self.collect(aio.parse(self.strings)))
+        self.assertEqual('3.0.0+b', self.collect(aio.parse(self.strings))[3].string)
+
+    def testInvalid(self):
+        strings = self.strings + ['1.2']
+        self.assertRaises(version.InvalidVersionStringError, self.collect, aio.parse(strings))
+        self.assertEqual(5, len(self.collect(aio.parse(strings, skip=True))))
+        self.assertEqual(6, len(self.collect(aio.parse(strings, strict=False))))
+
+    def testInvalidPrefix(self):
+        async def consume(stream, yielded):
+            try:
+                async for v in stream: yielded.append(v)
+            except version.InvalidVersionStringError:
+                return yielded
+        strings = ['1.0.0', '2.0.0', 'x', '3.0.0', 'y']
+        for chunksize in (1, 2, 100):
+            self.assertEqual([Version('1.0.0'), Version('2.0.0')],
+                             asyncio.run(consume(aio.parse(strings, chunksize=chunksize), [])))
+        with concurrent.futures.ThreadPoolExecutor(2) as executor:
+            stream = aio.match(strings, Matcher(min='2.0.0'), chunksize=100, executor=executor)
+            self.assertEqual([Version('2.0.0')], asyncio.run(consume(stream, [])))
+
+    def testMatch(self):
+        matcher = Matcher(min='1.0.0', max='2.0.0', but=['1.2.3'])
+        items = self.strings + [Version('1.5.0'), Version('4.0.0')]
+        expected = ['1.0.0', '2.0.0-rc.1', '1.5.0']
+        self.assertEqual(expected, [v.string for v in self.collect(aio.match(self.source(items), matcher))])
+        with concurrent.futures.ThreadPoolExecutor(2) as executor:
+            stream = aio.match(items, matcher, chunksize=1, executor=executor, prefetch=3)
+            self.assertEqual(expected, [v.string for v in self.collect(stream)])
+
+    def testEarlyClose(self):
+        async def first(executor):
+            async for v in aio.parse(self.strings * 100, chunksize=10, executor=executor): return v
+        with concurrent.futures.ThreadPoolExecutor(1) as executor:
+            self.assertEqual(Version('1.0.0'), asyncio.run(first(executor)))
+
+
+@unittest.skipIf(arrays.numpy is None, 'numpy is not installed')
+class VersionArrayTests(unittest.TestCase):
+    strings = ['1.0.0', '1.0', '1.0.0-rc.1', '1.0.0-rc.a', '0.9.9.9', '1.0.0+42', '1', '1.0.0.0-1']
+
+    def setUp(self):
+        self.versions = [Version(s, strict=False) for s in self.strings]
+        self.array = arrays.VersionArray(self.versions, strict=False)
+
+    def testHugeComponents(self):
+        strings = ['1.0.99999999999999999999', '1.0.99999999999999999998', '1.0.5', '1.0.99999999999999999999-rc.1',
+                   '1.0.99999999999999999999+build']
+        versions = [Version(s, strict=False) for s in strings]
+        array = arrays.VersionArray(versions, strict=False)
+        self.assertEqual(sorted(versions), list(array.sort()))
+        self.assertEqual(versions[0], array.max())
+        self.assertEqual(object, array.base.dtype)
+        self.assertEqual(4, len(array.unique()))
+        for other in versions + [Version('1.0.99999999999999999999.1', strict=False)]:
+            self.assertEqual([(v > other) - (v < other) for v in versions], array.compare(other).tolist())
+        self.assertEqual([0] * 5, array.compare(arrays.VersionArray(versions, strict=False)).tolist())
+        small = arrays.VersionArray(['1.0.0', '2.0.0'])
+        self.assertEqual([True, False], small.lt('1.0.99999999999999999999').tolist())
+
+    def testCompareScalar(self):
+        for other in self.versions + [Version('1.0.0-rc.0', strict=False), Version('2.0.0.0.0', strict=False)]:
+            expected = [(v > other) - (v < other) for v in self.versions]
+            self.assertEqual(expected, self.array.compare(other).tolist())
+            self.assertEqual([v < other for v in self.versions], self.array.lt(other).tolist())
+
+    def testCompareArrays(self):
+        other = arrays.VersionArray(reversed(self.versions), strict=False)
+        expected = [v >= w for v, w in zip(self.versions, reversed(self.versions))]
+        self.assertEqual(expected, (self.array >= other).tolist())
+
+    def testSorting(self):
+        self.assertEqual([v.key for v in sorted(self.versions)], [v.key for v in self.array.sort()])
+        self.assertEqual('1.0.0.0-1', repr(self.array.max()))
+        self.assertEqual('0.9.9.9', repr(self.array.min()))
+        self.assertEqual(len(set(self.versions)), len(self.array.unique()))
+
+
 if __name__ == '__main__': unittest.main()